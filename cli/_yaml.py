@@ -0,0 +1,57 @@
+"""
+YAML helpers for the CLI commands.
+
+Loads and dumps through PyYAML's libyaml bindings when they are available,
+falling back to pure-Python PyYAML. ScenarioManager parses with the same
+loader, so every command sees the same YAML 1.1 data for a file.
+"""
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as _LOADER, CSafeDumper as _DUMPER
+except ImportError:
+    from yaml import SafeLoader as _LOADER, SafeDumper as _DUMPER
+
+
+def loads(data):
+    """Parse a single YAML document from bytes or str."""
+    return yaml.load(data, Loader=_LOADER)
+
+
+def load(fp):
+    """Parse a single YAML document from an open file object.
+
+    The file is read in one call so the parser scans a contiguous buffer
+    instead of refilling from the stream as it goes.
+    """
+    return loads(fp.read())
+
+
+def dump(obj, fp):
+    """Write obj to a file opened in binary mode as UTF-8 block-style YAML.
+
+    Keys keep their insertion order, so sections come out in the order the
+    scenario was built rather than alphabetically.
+    """
+    yaml.dump(
+        obj,
+        fp,
+        Dumper=_DUMPER,
+        default_flow_style=False,
+        indent=2,
+        sort_keys=False,
+        allow_unicode=True,
+        encoding="utf-8",
+    )
+
+
+def load_path(path):
+    """Load a YAML file from a path.
+
+    Scenario parses are cached on disk only by ScenarioManager; a single
+    file passed to play or clean is parsed once per run, so it is read
+    directly here.
+    """
+    with open(path, "rb") as f:
+        return loads(f.read())
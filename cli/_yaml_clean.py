@@ -0,0 +1,49 @@
+"""
+Conversion of scenario data into plain YAML-safe values.
+
+Kept free of closures and dynamic tricks so it can be compiled with mypyc;
+a compiled extension module takes precedence over this file on import.
+"""
+
+from datetime import datetime
+from typing import Any, List, Tuple
+
+_SCALARS = (str, int, float, bool, type(None))
+_PLAIN = _SCALARS + (dict, list)
+
+
+def clean_scenario_for_yaml(scenario: Any) -> Any:
+    """Clean scenario data to ensure proper YAML serialization without Python objects"""
+
+    # Walk the tree with an explicit stack of (container, key, value) slots
+    # instead of recursing. Containers are rebuilt rather than mutated, so
+    # the original scenario is left untouched.
+    root: List[Any] = [None]
+    stack: List[Tuple[Any, Any, Any]] = [(root, 0, scenario)]
+    while stack:
+        parent, key, value = stack.pop()
+
+        # Unwrap objects until we reach a container or a plain value
+        while not isinstance(value, _PLAIN):
+            if isinstance(value, datetime):
+                value = value.isoformat()
+            elif hasattr(value, "to_dict"):  # Handle any remaining dataclass objects
+                value = value.to_dict()
+            elif hasattr(value, "__dict__"):  # Handle any other objects
+                value = value.__dict__
+            else:
+                break
+
+        if isinstance(value, _SCALARS):
+            parent[key] = value
+        elif isinstance(value, dict):
+            # fromkeys fixes the key order before the children are filled in
+            cleaned = parent[key] = dict.fromkeys(value)
+            stack.extend((cleaned, k, v) for k, v in value.items())
+        elif isinstance(value, list):
+            cleaned = parent[key] = [None] * len(value)
+            stack.extend((cleaned, i, item) for i, item in enumerate(value))
+        else:
+            parent[key] = value
+
+    return root[0]
@@ -6,9 +6,11 @@ Manages interactive incident response game sessions with AI facilitation.
 
 import time
 import logging
+import re
+import uuid
 
 # import random
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Dict
 from pathlib import Path
 
@@ -16,12 +18,94 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 from rich.prompt import Prompt, Confirm
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.live import Live
+from rich.text import Text
 
 from facilitator.ai_facilitator import get_facilitator
-from facilitator.mock_facilitator import MockAIFacilitator
 from scoring.scorer import IncidenterScorer
-from utils.session_manager import SessionManager
+from utils.response_cache import FacilitatorCache
+from utils.session_manager import SessionManager, SessionState
+
+_HELP_CONTENT = """[bold]Available Commands:[/bold]
+• [cyan]<investigation request>[/cyan] - Ask to investigate something specific
+• [cyan]theory[/cyan] - Submit your attack theory for scoring
+• [cyan]status[/cyan] - Show detailed session status
+• [cyan]evidence[/cyan] - View all discovered evidence and clues
+• [cyan]evidence detail E001[/cyan] - View full details for specific evidence
+• [cyan]hint[/cyan] - Get a hint (doesn't count as investigation)
+• [cyan]help[/cyan] - Show this help message
+• [cyan]quit[/cyan] - Exit the session (can resume later)
+
+[bold]Investigation Examples:[/bold]
+• "Check firewall logs for suspicious connections"
+• "Examine running processes on the affected server"
+• "Review authentication logs for unusual activity"
+• "Analyze network traffic for data exfiltration"
+• "Look for persistence mechanisms in the registry"
+
+[bold]Tips:[/bold]
+• Be specific in your investigation requests
+• Follow up on interesting findings
+• Consider the attack timeline
+• Watch out for red herrings!"""
+
+_STATUS_TEMPLATE = """[bold]Investigation Questions Remaining:[/bold] {remaining}
+[bold]Clues Discovered:[/bold] {clues}
+[bold]Current Score:[/bold] {score}"""
+
+# Scenario difficulty values mapped to internal complexity levels
+_DIFFICULTY_MAPPING = {
+    "easy": "beginner",
+    "medium": "intermediate",
+    "hard": "advanced",
+    "expert": "expert",
+    "beginner": "beginner",
+    "intermediate": "intermediate",
+    "advanced": "advanced",
+}
+
+_BASE_INVESTIGATIONS = {
+    "beginner": 30,
+    "intermediate": 25,
+    "advanced": 20,
+    "expert": 10,
+}
+
+_QUIT_COMMANDS = frozenset({"quit", "exit"})
+_EVIDENCE_DETAIL_PREFIX = "evidence detail "
+
+_LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+# Package loggers whose records also go to the session log file
+_APP_LOGGERS = ("cli", "facilitator", "scoring", "utils")
+
+# Markdown stripping for the evidence table's key findings column. The
+# alternatives are tried in the order the cleanup steps apply.
+_MARKDOWN = re.compile(
+    r"(?P<code>```[\s\S]*?```)"
+    r"|(?P<emphasis>[*_~`]+(?P<emphasized>[^*_~`]+)[*_~`]+)"
+    r"|(?P<header>^#{1,6}\s+)"
+    r"|(?P<link>\[(?P<link_text>[^\]]+)\]\([^\)]+\))",
+    re.MULTILINE,
+)
+
+_SENTENCE = re.compile(r"[^.]+")
+
+
+def _markdown_replacement(match) -> str:
+    """Replacement for one _MARKDOWN match"""
+    kind = match.lastgroup
+    if kind == "code":
+        return "[Code Block]"
+    if kind == "emphasis":
+        return _strip_markdown(match.group("emphasized"))
+    if kind == "link":
+        return _strip_markdown(match.group("link_text"))
+    return ""
+
+
+def _strip_markdown(text: str) -> str:
+    """Remove markdown formatting in a single regex pass"""
+    return _MARKDOWN.sub(_markdown_replacement, text)
 
 
 class GameSession:
@@ -33,9 +117,19 @@ class GameSession:
         facilitator_model: str = "gemini-2.0-flash-001",
         team_size: int = 1,
         difficulty_adjustment: str = "normal",
+        use_cache: bool = True,
+        deterministic: bool = False,
+        semantic_cache: bool = False,
     ):
         self.scenario = scenario
+        scenario_meta = scenario.get("scenario_metadata", {})
+        self.scenario_id = scenario_meta.get("id", "unknown")
+        self.scenario_name = scenario_meta.get("name", "Unknown Scenario")
         self.console = Console()
+        # Reused for every streamed investigation. Without auto-refresh it
+        # runs no render thread and redraws only when a chunk arrives.
+        # Transient, so the formatted result panel replaces it.
+        self._live = Live(console=self.console, auto_refresh=False, transient=True)
 
         # Initialize AI facilitator with ADC support
         try:
@@ -46,7 +140,9 @@ class GameSession:
                     "[yellow]💡 Using default Google model: gemini-2.0-flash-001[/yellow]"
                 )
 
-            self.facilitator = get_facilitator(model=facilitator_model)
+            self.facilitator = get_facilitator(
+                model=facilitator_model, deterministic=deterministic
+            )
 
             # Check if we got the mock facilitator from get_facilitator
             if (
@@ -62,20 +158,37 @@ class GameSession:
             self.console.print(
                 f"[yellow]⚠️  Fallback to mock facilitator ({str(e)[:50]}...)[/yellow]"
             )
+            from facilitator.mock_facilitator import MockAIFacilitator
+
             self.facilitator = MockAIFacilitator()
             self.facilitator.load_scenario(scenario)
             self.using_mock_facilitator = True
 
         self.scorer = IncidenterScorer()
         self.session_manager = SessionManager()
+        # Whether a snapshot was saved, so the journal has a session to belong to
+        self._session_saved = False
+
+        # Reuse earlier answers to the same request in this scenario. Mock
+        # responses are cheap and must not leak into the cache.
+        self.response_cache = None
+        if use_cache and not self.using_mock_facilitator:
+            self.response_cache = FacilitatorCache(
+                self.scenario_id, semantic=semantic_cache
+            )
 
         # Session state
         self.team_size = team_size
         self.difficulty_adjustment = difficulty_adjustment
         self.session_id = self._generate_session_id()
         self.start_time = datetime.now()
+        # Record timestamps are offsets from here, so the clock is only
+        # read once per session
+        self._start_monotonic = time.monotonic()
         self.revealed_clues = set()
         self.investigation_history = []
+        # The "investigation" entries of investigation_history, in order
+        self._investigation_records = []
         self.player_theories = []
         self.current_score = 0
         self.red_herrings_encountered = []
@@ -84,35 +197,33 @@ class GameSession:
         self.max_investigations = self._get_max_investigations()
         self.red_herring_probability = 0.25
 
-        # Setup logging
-        self._setup_logging()
-
-    def start_session(self):
-        """Start the interactive game session"""
+        # Panels that only depend on the scenario and settings above
+        self._build_panels()
 
-        try:
-            self._display_welcome()
-            self._display_initial_alert()
-            self._main_game_loop()
-            self._conclude_session()
+        # Single-word commands accepted at the investigation prompt
+        self._commands = {
+            "theory": self._handle_theory_submission,
+            "status": self._display_detailed_status,
+            "evidence": self._display_evidence,
+            "help": self._display_help,
+            "hint": self._provide_hint,
+        }
 
-        except KeyboardInterrupt:
-            self._handle_early_exit()
-        except Exception as e:
-            self.console.print(f"\n❌ [red]Session error: {e}[/red]")
-            logging.error(f"Session error: {e}", exc_info=True)
+        # Setup logging
+        self._setup_logging()
 
-    def _display_welcome(self):
-        """Display welcome message and scenario overview"""
+    def _build_panels(self):
+        """Build the panels whose content is fixed for the whole session"""
 
         meta = self.scenario["scenario_metadata"]
+        env = meta["environment"]
 
         welcome_content = f"""
 [bold blue]🚨 INCIDENT RESPONSE EXERCISE 🚨[/bold blue]
 
 [bold]Scenario:[/bold] {meta['name']}
-[bold]Organization:[/bold] {meta['environment']['organization']['name']}
-[bold]Sector:[/bold] {meta['environment']['sector'].title()}
+[bold]Organization:[/bold] {env['organization']['name']}
+[bold]Sector:[/bold] {env['sector'].title()}
 [bold]Difficulty:[/bold] {meta['difficulty'].title()}
 [bold]Team Size:[/bold] {self.team_size}
 [bold]Estimated Duration:[/bold] {meta['estimated_duration']}
@@ -125,10 +236,7 @@ and reconstruct the complete attack timeline.[/yellow]
 [bold red]⚠️  Remember: Not all evidence is reliable. Stay vigilant for red herrings! ⚠️[/bold red]
         """
 
-        self.console.print(Panel(welcome_content.strip(), border_style="blue"))
-
-        # Brief pause for dramatic effect
-        time.sleep(2)
+        self._welcome_panel = Panel(welcome_content.strip(), border_style="blue")
 
         # Game instructions
         instructions = """
@@ -150,15 +258,10 @@ and reconstruct the complete attack timeline.[/yellow]
             max_investigations=self.max_investigations
         )
 
-        self.console.print(
-            Panel(instructions.strip(), title="Instructions", border_style="green")
+        self._instructions_panel = Panel(
+            instructions.strip(), title="Instructions", border_style="green"
         )
 
-        input("\nPress Enter to begin the incident response...")
-
-    def _display_initial_alert(self):
-        """Display the initial incident alert"""
-
         alert = self.scenario.get("initial_alert", {})
 
         alert_content = f"""
@@ -176,18 +279,57 @@ and reconstruct the complete attack timeline.[/yellow]
 [dim]{alert.get('raw_data', 'No additional raw data available.')}[/dim]
         """
 
-        self.console.print(
-            Panel(alert_content.strip(), title="Initial Alert", border_style="red")
+        self._alert_panel = Panel(
+            alert_content.strip(), title="Initial Alert", border_style="red"
         )
 
+        self._help_panel = Panel(_HELP_CONTENT, title="Help", border_style="cyan")
+
+    def start_session(self):
+        """Start the interactive game session"""
+
+        try:
+            self._display_welcome()
+            self._display_initial_alert()
+            self._main_game_loop()
+            self._conclude_session()
+
+        except KeyboardInterrupt:
+            self._handle_early_exit()
+        except Exception as e:
+            self.console.print(f"\n❌ [red]Session error: {e}[/red]")
+            self._logger.error("Session error: %s", e, exc_info=True)
+        finally:
+            self._close_logging()
+
+    def _display_welcome(self):
+        """Display welcome message and scenario overview"""
+
+        self.console.print(self._welcome_panel)
+
+        # Brief pause for dramatic effect
+        time.sleep(2)
+
+        # Game instructions
+        self.console.print(self._instructions_panel)
+
+        input("\nPress Enter to begin the incident response...")
+
+    def _display_initial_alert(self):
+        """Display the initial incident alert"""
+
+        self.console.print(self._alert_panel)
+
         # Log the initial alert
-        self.investigation_history.append(
-            {
-                "timestamp": datetime.now().isoformat(),
-                "type": "initial_alert",
-                "content": alert,
-                "investigator": "system",
-            }
+        alert_record = {
+            "timestamp": self._now_iso(),
+            "type": "initial_alert",
+            "content": self.scenario.get("initial_alert", {}),
+            "investigator": "system",
+        }
+        self.investigation_history.append(alert_record)
+        self.session_manager.append_event(
+            self.session_id, "investigation_actions", alert_record
         )
 
     def _main_game_loop(self):
@@ -208,31 +350,23 @@ and reconstruct the complete attack timeline.[/yellow]
                 continue
 
             # Handle special commands
-            if user_input.lower() in ["quit", "exit"]:
+            cmd = user_input.lower()
+            if cmd in _QUIT_COMMANDS:
                 if Confirm.ask("Are you sure you want to quit? You can resume later."):
                     self._save_session()
                     return
                 else:
                     continue
-            elif user_input.lower() == "theory":
-                self._handle_theory_submission()
-                continue
-            elif user_input.lower() == "status":
-                self._display_detailed_status()
-                continue
-            elif user_input.lower() == "evidence":
-                self._display_evidence()
+
+            handler = self._commands.get(cmd)
+            if handler is not None:
+                handler()
                 continue
-            elif user_input.lower().startswith("evidence detail "):
-                evidence_id = user_input.lower().replace("evidence detail ", "").strip()
+
+            if cmd.startswith(_EVIDENCE_DETAIL_PREFIX):
+                evidence_id = cmd[len(_EVIDENCE_DETAIL_PREFIX) :].strip()
                 self._display_detailed_evidence(evidence_id)
                 continue
-            elif user_input.lower() == "help":
-                self._display_help()
-                continue
-            elif user_input.lower() == "hint":
-                self._provide_hint()
-                continue
 
             # Process investigation request
             self._process_investigation(user_input)
@@ -256,34 +390,39 @@ and reconstruct the complete attack timeline.[/yellow]
     def _process_investigation(self, investigation_request: str):
         """Process a player's investigation request"""
 
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=self.console,
-        ) as progress:
-            task = progress.add_task("🔍 Investigating...", total=None)
-
-            # Determine if this investigation reveals a clue or red herring
-            # reveal_red_herring = random.random() < self.red_herring_probability and len(
-            #    self.red_herrings_encountered
-            # ) < len(self.scenario.get("red_herrings", []))
-
-            # Get response from AI facilitator
-            response = self.facilitator.facilitate_action(
-                action=investigation_request, details=""
+        # Determine if this investigation reveals a clue or red herring
+        # reveal_red_herring = random.random() < self.red_herring_probability and len(
+        #    self.red_herrings_encountered
+        # ) < len(self.scenario.get("red_herrings", []))
+
+        # Get response from the cache or the AI facilitator
+        response = None
+        if self.response_cache is not None:
+            response = self.response_cache.get(
+                investigation_request, self.revealed_clues
             )
 
-            progress.remove_task(task)
+        if response is None:
+            response = self._stream_investigation(investigation_request)
+            # Zero confidence marks the facilitator's error fallback
+            if self.response_cache is not None and response.confidence > 0:
+                self.response_cache.set(
+                    investigation_request, response, self.revealed_clues
+                )
 
         # Record investigation
         investigation_record = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": self._now_iso(),
             "type": "investigation",
             "request": investigation_request,
             "response": response,
             "investigator": "team",
         }
         self.investigation_history.append(investigation_record)
+        self._investigation_records.append(investigation_record)
+        self.session_manager.append_event(
+            self.session_id, "investigation_actions", investigation_record
+        )
 
         # Display response
         self._display_investigation_result(investigation_request, response)
@@ -297,6 +436,31 @@ and reconstruct the complete attack timeline.[/yellow]
         # For now, we don't track red herrings from the basic response
         # This would need to be enhanced based on the facilitator's response structure
 
+    def _stream_investigation(self, investigation_request: str):
+        """Ask the facilitator, showing the findings as they stream in"""
+
+        streamed = Text("🔍 Investigating...", style="dim")
+        live = self._live
+        live.update(
+            Panel(streamed, title="Investigation Results", border_style="green")
+        )
+
+        def on_token(chunk: str):
+            # Drop the placeholder once the first chunk arrives
+            if streamed.style:
+                streamed.plain = ""
+                streamed.style = ""
+            streamed.append(chunk)
+            live.refresh()
+
+        live.start(refresh=True)
+        try:
+            return self.facilitator.facilitate_action(
+                action=investigation_request, details="", on_token=on_token
+            )
+        finally:
+            live.stop()
+
     def _display_investigation_result(self, request: str, response):
         """Display the results of an investigation"""
 
@@ -365,12 +529,15 @@ and reconstruct the complete attack timeline.[/yellow]
 
         # Record theory
         theory_record = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": self._now_iso(),
             "theory": theory,
             "revealed_clues": list(self.revealed_clues),
             "red_herrings_encountered": self.red_herrings_encountered,
         }
         self.player_theories.append(theory_record)
+        self.session_manager.append_event(
+            self.session_id, "theories_submitted", theory_record
+        )
 
         # Score the theory
         score_result = self.scorer.score_theory(theory_record)
@@ -454,7 +621,7 @@ and reconstruct the complete attack timeline.[/yellow]
 
 [bold]Final Score:[/bold] {self.current_score}
 [bold]Duration:[/bold] {duration}
-[bold]Investigation Questions Used:[/bold] {len([h for h in self.investigation_history if h['type'] == 'investigation'])} / {self.max_investigations}
+[bold]Investigation Questions Used:[/bold] {len(self._investigation_records)} / {self.max_investigations}
 [bold]Theories Submitted:[/bold] {len(self.player_theories)}
 
 [bold]Session ID:[/bold] {self.session_id}
@@ -466,6 +633,8 @@ and reconstruct the complete attack timeline.[/yellow]
         if Confirm.ask("Would you like to save this session for review?"):
             self._save_session()
             self.console.print("[green]✅ Session saved successfully![/green]")
+        else:
+            self._discard_unsaved_journal()
 
         # Offer to play again
         if Confirm.ask("Would you like to try another scenario?"):
@@ -479,16 +648,14 @@ and reconstruct the complete attack timeline.[/yellow]
     def _display_status(self, investigations_remaining: int):
         """Display current session status"""
 
-        status_content = f"""
-[bold]Investigation Questions Remaining:[/bold] {investigations_remaining}
-[bold]Clues Discovered:[/bold] {len(self.revealed_clues)}
-[bold]Current Score:[/bold] {self.current_score}
-        """
-
-        self.console.print(
-            Panel(status_content.strip(), title="Status", border_style="blue")
+        status_content = _STATUS_TEMPLATE.format(
+            remaining=investigations_remaining,
+            clues=len(self.revealed_clues),
+            score=self.current_score,
         )
 
+        self.console.print(Panel(status_content, title="Status", border_style="blue"))
+
     def _display_detailed_status(self):
         """Display detailed session status"""
 
@@ -499,7 +666,7 @@ and reconstruct the complete attack timeline.[/yellow]
         history_table.add_column("Summary", style="white")
 
         for record in self.investigation_history[-10:]:  # Last 10 entries
-            time_str = record["timestamp"][-8:-3]  # HH:MM format
+            time_str = record["timestamp"][11:16]  # HH:MM format
             type_str = record["type"].replace("_", " ").title()
 
             if record["type"] == "investigation":
@@ -548,10 +715,7 @@ and reconstruct the complete attack timeline.[/yellow]
     def _display_evidence(self):
         """Display all discovered evidence/clues"""
 
-        # Count actual investigation records
-        investigation_records = [
-            r for r in self.investigation_history if r["type"] == "investigation"
-        ]
+        investigation_records = self._investigation_records
 
         if not investigation_records and not self.revealed_clues:
             self.console.print(
@@ -572,25 +736,19 @@ and reconstruct the complete attack timeline.[/yellow]
         evidence_table.add_column("Key Findings", style="white", width=80)
 
         # Add investigation results as evidence entries
-        evidence_count = 0
-        for i, record in enumerate(self.investigation_history, 1):
-            if record["type"] == "investigation":
-                evidence_count += 1
-                time_str = record["timestamp"][-8:-3]  # HH:MM format
-                investigation = self._truncate_text(record["request"], 38)
-
-                # Extract key findings from response content
-                response = record.get("response", {})
-                if hasattr(response, "content"):
-                    findings = self._extract_key_findings(
-                        response.content, max_length=78
-                    )
-                else:
-                    findings = "Investigation completed"
+        evidence_count = len(investigation_records)
+        for i, record in enumerate(investigation_records, 1):
+            time_str = record["timestamp"][11:16]  # HH:MM format
+            investigation = self._truncate_text(record["request"], 38)
+
+            # Extract key findings from response content
+            response = record.get("response", {})
+            if hasattr(response, "content"):
+                findings = self._extract_key_findings(response.content, max_length=78)
+            else:
+                findings = "Investigation completed"
 
-                evidence_table.add_row(
-                    f"E{evidence_count:03d}", time_str, investigation, findings
-                )
+            evidence_table.add_row(f"E{i:03d}", time_str, investigation, findings)
 
         self.console.print(evidence_table)
 
@@ -632,10 +790,7 @@ and reconstruct the complete attack timeline.[/yellow]
             )
             return
 
-        # Get investigation records
-        investigation_records = [
-            r for r in self.investigation_history if r["type"] == "investigation"
-        ]
+        investigation_records = self._investigation_records
 
         if evidence_index < 0 or evidence_index >= len(investigation_records):
             self.console.print(
@@ -678,52 +833,25 @@ and reconstruct the complete attack timeline.[/yellow]
     def _display_help(self):
         """Display help information"""
 
-        help_content = """
-[bold]Available Commands:[/bold]
-• [cyan]<investigation request>[/cyan] - Ask to investigate something specific
-• [cyan]theory[/cyan] - Submit your attack theory for scoring
-• [cyan]status[/cyan] - Show detailed session status
-• [cyan]evidence[/cyan] - View all discovered evidence and clues
-• [cyan]evidence detail E001[/cyan] - View full details for specific evidence
-• [cyan]hint[/cyan] - Get a hint (doesn't count as investigation)
-• [cyan]help[/cyan] - Show this help message
-• [cyan]quit[/cyan] - Exit the session (can resume later)
-
-[bold]Investigation Examples:[/bold]
-• "Check firewall logs for suspicious connections"
-• "Examine running processes on the affected server"
-• "Review authentication logs for unusual activity"
-• "Analyze network traffic for data exfiltration"
-• "Look for persistence mechanisms in the registry"
-
-[bold]Tips:[/bold]
-• Be specific in your investigation requests
-• Follow up on interesting findings
-• Consider the attack timeline
-• Watch out for red herrings!
-        """
-
-        self.console.print(
-            Panel(help_content.strip(), title="Help", border_style="cyan")
-        )
+        self.console.print(self._help_panel)
 
     def _save_session(self):
-        """Save current session state"""
-        from utils.session_manager import SessionState
-        from datetime import datetime
+        """Save a snapshot of the session state.
 
+        Investigation history and theories are journaled as they happen, so
+        the snapshot leaves them out and the session manager merges the
+        journal back in on load.
+        """
         session_data = SessionState(
             session_id=self.session_id,
-            scenario_id=self.scenario.get("scenario_metadata", {}).get("id", "unknown"),
-            scenario_name=self.scenario.get("scenario_metadata", {}).get(
-                "name", "Unknown Scenario"
-            ),
+            scenario_id=self.scenario_id,
+            scenario_name=self.scenario_name,
             player_name=getattr(self, "player_name", "Anonymous"),
             start_time=self.start_time,
             current_phase=getattr(self, "current_phase", "investigation"),
-            investigation_actions=self.investigation_history,
+            investigation_actions=[],
             evidence_discovered=list(self.revealed_clues),
-            theories_submitted=self.player_theories,
+            theories_submitted=[],
             hints_used=getattr(self, "hints_used", 0),
             score_checkpoints=[],
             is_completed=False,
@@ -731,15 +859,21 @@ and reconstruct the complete attack timeline.[/yellow]
             final_score=self.current_score,
             session_notes="",
             metadata={
-                "scenario": self.scenario,
+                "journaled_fields": ["investigation_actions", "theories_submitted"],
                 "team_size": self.team_size,
                 "difficulty_adjustment": self.difficulty_adjustment,
                 "red_herrings_encountered": self.red_herrings_encountered,
-                "end_time": datetime.now().isoformat(),
+                "end_time": self._now_iso(),
             },
         )
 
         self.session_manager.save_session(session_data)
+        self._session_saved = True
+
+    def _discard_unsaved_journal(self):
+        """Delete the event journal unless a snapshot already refers to it"""
+        if not self._session_saved:
+            self.session_manager.discard_journal(self.session_id)
 
     def _handle_early_exit(self):
         """Handle early exit from session"""
@@ -750,45 +884,32 @@ and reconstruct the complete attack timeline.[/yellow]
             self._save_session()
             self.console.print("[green]✅ Progress saved![/green]")
             self.console.print(f"[blue]Session ID: {self.session_id}[/blue]")
+        else:
+            self._discard_unsaved_journal()
 
         self.console.print("Thank you for playing Incidenter!")
 
+    def _now_iso(self) -> str:
+        """Current time as an ISO string, derived from the monotonic clock"""
+        elapsed = time.monotonic() - self._start_monotonic
+        return (self.start_time + timedelta(seconds=elapsed)).isoformat()
+
     def _generate_session_id(self) -> str:
         """Generate unique session ID"""
-        import uuid
-
-        return f"INC-{datetime.now().strftime('%Y%m%d')}-{str(uuid.uuid4())[:8]}"
+        return f"INC-{datetime.now():%Y%m%d}-{uuid.uuid4().hex[:8]}"
 
     def _get_max_investigations(self) -> int:
         """Get maximum investigations based on scenario complexity"""
 
         complexity = self.scenario["scenario_metadata"]["difficulty"].lower()
 
-        # Map scenario difficulty values to internal complexity levels
-        difficulty_mapping = {
-            "easy": "beginner",
-            "medium": "intermediate",
-            "hard": "advanced",
-            "expert": "expert",
-            "beginner": "beginner",
-            "intermediate": "intermediate",
-            "advanced": "advanced",
-        }
-
         # Get mapped complexity or default to intermediate
-        mapped_complexity = difficulty_mapping.get(complexity, "intermediate")
-
-        base_investigations = {
-            "beginner": 30,
-            "intermediate": 25,
-            "advanced": 20,
-            "expert": 10,
-        }
+        mapped_complexity = _DIFFICULTY_MAPPING.get(complexity, "intermediate")
 
         # Adjust for team size
         team_multiplier = min(1.5, 1 + (self.team_size - 1) * 0.1)
 
-        return int(base_investigations[mapped_complexity] * team_multiplier)
+        return int(_BASE_INVESTIGATIONS[mapped_complexity] * team_multiplier)
 
     def _setup_logging(self):
         """Setup session logging"""
@@ -798,15 +919,36 @@ and reconstruct the complete attack timeline.[/yellow]
 
         log_file = log_dir / f"{self.session_id}.log"
 
-        logging.basicConfig(
-            filename=log_file,
-            level=logging.INFO,
-            format="%(asctime)s - %(levelname)s - %(message)s",
-        )
-
-        logging.info(f"Session started: {self.session_id}")
-        logging.info(f"Scenario: {self.scenario['scenario_metadata']['name']}")
-        logging.info(f"Team size: {self.team_size}")
+        # A logger per session, so concurrent sessions each write their own
+        # file and the root logger is left alone
+        handler = logging.FileHandler(log_file)
+        handler.setFormatter(logging.Formatter(_LOG_FORMAT))
+        self._log_handler = handler
+
+        self._logger = logging.getLogger(f"incidenter.session.{self.session_id}")
+        self._logger.setLevel(logging.INFO)
+        self._logger.propagate = False
+        self._logger.addHandler(handler)
+
+        # Facilitator, cache and session manager messages belong in the same
+        # file; with a handler attached they also stay off the terminal
+        for name in _APP_LOGGERS:
+            app_logger = logging.getLogger(name)
+            if app_logger.level == logging.NOTSET:
+                app_logger.setLevel(logging.INFO)
+            app_logger.addHandler(handler)
+
+        self._logger.info("Session started: %s", self.session_id)
+        self._logger.info("Scenario: %s", self.scenario_name)
+        self._logger.info("Team size: %s", self.team_size)
+
+    def _close_logging(self):
+        """Detach and close the session log handler"""
+
+        self._logger.removeHandler(self._log_handler)
+        for name in _APP_LOGGERS:
+            logging.getLogger(name).removeHandler(self._log_handler)
+        self._log_handler.close()
 
     def _extract_key_findings(self, content: str, max_length: int = 80) -> str:
         """
@@ -824,35 +966,23 @@ and reconstruct the complete attack timeline.[/yellow]
         Returns:
             Cleaned and truncated key findings
         """
-        import re
-
         if not content or not content.strip():
             return "No findings available"
 
-        # Remove markdown code blocks (```...```)
-        content = re.sub(r"```[\s\S]*?```", "[Code Block]", content)
-
-        # Remove markdown formatting (* ** _ __ ~ ~~)
-        content = re.sub(r"[*_~`]+([^*_~`]+)[*_~`]+", r"\1", content)
-
-        # Remove markdown headers (# ## ###)
-        content = re.sub(r"^#{1,6}\s+", "", content, flags=re.MULTILINE)
+        # Replace code blocks, unwrap formatting, headers and links, then
+        # collapse whitespace
+        content = " ".join(_strip_markdown(content).split())
 
-        # Remove markdown links [text](url)
-        content = re.sub(r"\[([^\]]+)\]\([^\)]+\)", r"\1", content)
-
-        # Clean up extra whitespace and newlines
-        content = re.sub(r"\s+", " ", content).strip()
-
-        # Split into sentences and extract the most meaningful ones
-        sentences = [s.strip() for s in content.split(".") if s.strip()]
-
-        if not sentences:
-            return "Investigation completed"
-
-        # Build summary from first few sentences
+        # Build summary from first few sentences, reading them lazily since
+        # the summary usually fills up long before the content runs out
         summary = ""
-        for sentence in sentences:
+        found_sentence = False
+        for match in _SENTENCE.finditer(content):
+            sentence = match.group().strip()
+            if not sentence:
+                continue
+            found_sentence = True
+
             # Skip very short or generic sentences
             if len(sentence) < 10 or sentence.lower().startswith(
                 ("okay", "let me", "i will", "here is")
@@ -870,6 +1000,9 @@ and reconstruct the complete attack timeline.[/yellow]
                     summary += sentence[:remaining_space] + "..."
                 break
 
+        if not found_sentence:
+            return "Investigation completed"
+
         # If we couldn't build a summary, take the beginning of the content
         if not summary.strip():
             if len(content) <= max_length:
@@ -5,8 +5,6 @@ Generates realistic cybersecurity incident scenarios based on historical attacks
 and customizable parameters.
 """
 
-import yaml
-import json
 import random
 from pathlib import Path
 from typing import Dict, List, Optional, Any
@@ -152,16 +150,10 @@ class ScenarioGenerator:
 
         prompt = self._build_generation_prompt(params)
 
-        # Get AI response
-        ai_response = self.facilitator.generate_scenario(prompt)
+        # Get AI response, already parsed into a scenario dict
+        scenario = self.facilitator.generate_scenario(prompt, return_dict=True)
 
-        try:
-            # Parse AI response as YAML/JSON
-            if ai_response.strip().startswith("{"):
-                scenario = json.loads(ai_response)
-            else:
-                scenario = yaml.safe_load(ai_response)
-        except (json.JSONDecodeError, yaml.YAMLError):
+        if scenario is None:
             # Fallback to template-based generation
             scenario = self._generate_from_template(params)
 
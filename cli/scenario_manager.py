@@ -5,10 +5,328 @@ Manages scenario files, validation, and metadata operations.
 """
 
 import yaml
+import atexit
+import copy
+import hashlib
 import json
+import mmap
+import os
+import pickle
+import re
+import shutil
+import weakref
 from pathlib import Path
-from typing import Dict, List, Any, Tuple, Optional
-from collections import defaultdict
+from typing import Callable, Dict, List, Any, Tuple, Optional
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+try:
+    from yaml import CSafeLoader as _LOADER, CSafeDumper as _DUMPER
+except ImportError:
+    from yaml import SafeLoader as _LOADER, SafeDumper as _DUMPER
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+
+_REQUIRED_SECTIONS = ("scenario_metadata", "attack_overview", "initial_alert")
+_REQUIRED_METADATA_FIELDS = ("name", "id", "version", "environment", "difficulty")
+_REQUIRED_ALERT_FIELDS = ("alert_type", "timestamp", "description")
+_REQUIRED_PHASE_FIELDS = ("phase", "description")
+_REQUIRED_PHASE_SET = frozenset(_REQUIRED_PHASE_FIELDS)
+_VALID_SECTORS = frozenset(
+    {
+        "finance",
+        "healthcare",
+        "government",
+        "technology",
+        "retail",
+        "energy",
+        "manufacturing",
+        "education",
+        "transportation",
+        "utilities",
+        "telecommunications",
+        "media",
+        "defense",
+    }
+)
+
+# Structural schema mirroring the checks in validate_scenario. A scenario that
+# passes it is valid; anything else goes through the detailed checks so the
+# full list of errors can be reported.
+_SCHEMA = {
+    "$schema": "https://json-schema.org/draft/2020-12/schema",
+    "type": "object",
+    "required": list(_REQUIRED_SECTIONS),
+    "properties": {
+        "scenario_metadata": {
+            "type": "object",
+            "required": list(_REQUIRED_METADATA_FIELDS),
+            "properties": {
+                "environment": {
+                    "type": "object",
+                    "required": ["sector", "organization"],
+                    "properties": {
+                        "sector": {"enum": sorted(_VALID_SECTORS)},
+                        "organization": {"type": "object"},
+                    },
+                },
+            },
+        },
+        "attack_overview": {
+            "type": "object",
+            "properties": {
+                "kill_chain": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "required": list(_REQUIRED_PHASE_FIELDS),
+                    },
+                },
+            },
+        },
+        "initial_alert": {
+            "type": "object",
+            "required": list(_REQUIRED_ALERT_FIELDS),
+        },
+    },
+}
+
+_VALIDATE = fastjsonschema.compile(_SCHEMA) if fastjsonschema else None
+
+if msgspec is not None:
+
+    class ScenarioIndexEntry(msgspec.Struct, omit_defaults=True):
+        """Searchable summary of one scenario in the index"""
+
+        id: str
+        name: str
+        file_path: str
+        sector: str
+        difficulty: str
+        is_library: bool
+        inspiration: Optional[str] = None
+        techniques: Optional[List[str]] = None
+
+    class IndexedFile(msgspec.Struct):
+        """Metadata sidecar entry for one scenario file"""
+
+        mtime_ns: int
+        size: int
+        is_library: bool
+        metadata: Dict[str, Any]
+
+    class ScenarioIndex(msgspec.Struct):
+        """Layout of scenarios/index.msgpack"""
+
+        scenarios: List[ScenarioIndexEntry]
+        sectors: List[str]
+        difficulties: List[str]
+        attack_inspirations: List[str]
+        techniques: List[str]
+        files: Dict[str, IndexedFile]
+
+    # Metadata is free-form YAML, so values msgpack cannot hold go as strings
+    _INDEX_ENCODER = msgspec.msgpack.Encoder(enc_hook=str)
+    _INDEX_DECODER = msgspec.msgpack.Decoder(ScenarioIndex)
+
+
+def _write_json(path: Path, data: Any, indent: bool = False) -> None:
+    """Write data as JSON, using orjson when it is installed"""
+
+    if orjson is not None:
+        # Datetimes go through default=str, matching the json fallback
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        path.write_bytes(orjson.dumps(data, default=str, option=option))
+        return
+
+    with open(path, "w") as f:
+        if indent:
+            json.dump(data, f, indent=2, default=str)
+        else:
+            json.dump(data, f, separators=(",", ":"), default=str)
+
+
+def _read_json(path: Path) -> Any:
+    """Read a JSON file, using orjson when it is installed"""
+
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def _fast_copy(src: Path, dst: Path) -> None:
+    """Copy a file with an in-kernel copy where supported, keeping metadata.
+
+    Falls back to shutil.copyfile when copy_file_range is unavailable or the
+    kernel refuses it (e.g. across filesystems).
+    """
+
+    if dst.exists() and os.path.samefile(src, dst):
+        raise shutil.SameFileError(f"{src} and {dst} are the same file")
+
+    try:
+        if not hasattr(os, "copy_file_range"):
+            raise OSError("copy_file_range not supported")
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            remaining = os.fstat(fsrc.fileno()).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+    except OSError:
+        shutil.copyfile(src, dst)
+
+    shutil.copystat(src, dst)
+
+
+def _prefetch(path: Path) -> None:
+    """Ask the kernel to start reading a file into the page cache"""
+
+    if not hasattr(os, "posix_fadvise"):
+        return
+
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+# Files above this size are memory-mapped instead of read through a buffer
+_MMAP_THRESHOLD = 256 * 1024
+# Parse caches live in the user's cache directory, never in the scenario tree
+_CACHE_DIR = Path("~/.cache/incidenter").expanduser()
+
+# Managers whose parse caches are saved at exit, held weakly so the exit hook
+# does not keep them alive
+_MANAGERS: "weakref.WeakSet[ScenarioManager]" = weakref.WeakSet()
+
+
+def _save_parse_caches() -> None:
+    """Persist the parse cache of every live ScenarioManager"""
+
+    for manager in list(_MANAGERS):
+        manager._save_parse_cache()
+
+
+atexit.register(_save_parse_caches)
+
+
+def _read_yaml(path: Path, size: int) -> Any:
+    """Parse a YAML file from an unbuffered binary stream.
+
+    The parser pulls bytes straight from the file descriptor, and large files
+    are memory-mapped so no intermediate copy of the contents is made.
+    """
+
+    with open(path, "rb", buffering=0) as f:
+        if size > _MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return yaml.load(mm, Loader=_LOADER)
+        return yaml.load(f, Loader=_LOADER)
+
+
+# Start of the top-level metadata block, and the start of whatever top-level
+# key or document marker follows it. Indentless "- " items and comments at
+# column 0 still belong to the block.
+_METADATA_START = re.compile(rb"^scenario_metadata:", re.MULTILINE)
+_TOP_LEVEL_LINE = re.compile(rb"^[^\s#-]", re.MULTILINE)
+
+
+def _read_metadata(path: Path, size: int) -> Optional[Dict]:
+    """Parse only the scenario_metadata block of a scenario file.
+
+    Scans the raw bytes for the block's boundaries, memory-mapping large
+    files, and parses just that slice. Returns None when the block cannot
+    be isolated so the caller can fall back to a full parse.
+
+    The rest of the file is still run through the YAML parser without
+    building any objects, so a file that is broken past the metadata block
+    raises yaml.YAMLError just as a full parse would.
+    """
+
+    if size == 0:
+        return None
+
+    with open(path, "rb") as f:
+        if size > _MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                _check_syntax(mm)
+                block = _metadata_block(mm)
+        else:
+            buf = f.read()
+            _check_syntax(buf)
+            block = _metadata_block(buf)
+
+    if block is None:
+        return None
+
+    try:
+        data = yaml.load(block, Loader=_LOADER)
+    except yaml.YAMLError:
+        return None
+
+    metadata = data.get("scenario_metadata") if isinstance(data, dict) else None
+    return metadata if isinstance(metadata, dict) else None
+
+
+def _check_syntax(buf: Any) -> None:
+    """Run a YAML document through the parser, raising on syntax errors"""
+
+    for _ in yaml.parse(buf, Loader=_LOADER):
+        pass
+
+
+def _metadata_block(buf: Any) -> Optional[bytes]:
+    """Slice the scenario_metadata block out of a bytes-like buffer"""
+
+    start = _METADATA_START.search(buf)
+    if start is None:
+        return None
+
+    end = _TOP_LEVEL_LINE.search(buf, start.end())
+    return buf[start.start() : end.start() if end else len(buf)]
+
+
+@lru_cache(maxsize=128)
+def _compile_path(field_path: str) -> Callable[[Any], Any]:
+    """Build a getter for a dot-notation field path"""
+
+    keys = tuple(field_path.split("."))
+
+    def get(data: Any) -> Any:
+        value = data
+        for key in keys:
+            value = value.get(key) if isinstance(value, dict) else None
+            if value is None:
+                return None
+        return value
+
+    return get
 
 
 class ScenarioManager:
@@ -18,101 +336,330 @@ class ScenarioManager:
         self.library_dir = Path("scenarios/library")
         self.generated_dir = Path("scenarios/generated")
         self.templates_dir = Path("templates")
+        self.index_file = Path("scenarios/index.json")
+        self.binary_index_file = Path("scenarios/index.msgpack")
+        # One parse cache file per scenarios directory, since keys are the
+        # relative paths used here
+        scenarios_dir = os.path.abspath("scenarios")
+        digest = hashlib.blake2b(scenarios_dir.encode(), digest_size=16).hexdigest()
+        self.parse_cache_file = _CACHE_DIR / f"parse-{digest}.pkl"
+
+        # Parsed YAML keyed by path, stored as (st_mtime_ns, st_size, data),
+        # and metadata blocks parsed on their own for listings, stored the
+        # same way. Seeded from disk and written back at exit if changed.
+        self._parse_cache: Dict[Path, Tuple[int, int, Dict]]
+        self._metadata_cache: Dict[Path, Tuple[int, int, Dict]]
+        self._parse_cache, self._metadata_cache = self._load_parse_cache()
+        self._parse_cache_dirty = False
+        _MANAGERS.add(self)
+
+        # Directory listings keyed by directory, stored as (st_mtime_ns, paths)
+        self._glob_cache: Dict[Path, Tuple[int, List[Path]]] = {}
+
+        # Metadata sidecar loaded from index.json, keyed by file path
+        self._file_index: Optional[Dict[str, Dict]] = None
+
+        # Scenario ID -> file path, built lazily from the listing
+        self._id_to_path: Optional[Dict[str, Path]] = None
+
+        # Lowercased search text keyed by (file path, search fields)
+        self._search_haystack: Dict[Tuple[str, Tuple[str, ...]], Tuple[Dict, str]] = {}
 
         # Ensure directories exist
         self.library_dir.mkdir(parents=True, exist_ok=True)
         self.generated_dir.mkdir(parents=True, exist_ok=True)
 
+    def _load_yaml_cached(self, path: Path) -> Dict:
+        """Load a scenario YAML file, reusing the last parse if unchanged.
+
+        The returned dict is shared with the cache and must not be mutated;
+        public methods hand out copies.
+        """
+
+        path = Path(path)
+        st = path.stat()
+        cached = self._parse_cache.get(path)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+
+        data = _read_yaml(path, st.st_size)
+        self._parse_cache[path] = (st.st_mtime_ns, st.st_size, data)
+        self._parse_cache_dirty = True
+        return data
+
+    def _load_parse_cache(self) -> Tuple[Dict, Dict]:
+        """Load the parse and metadata caches persisted by a previous run"""
+
+        try:
+            with open(self.parse_cache_file, "rb") as f:
+                parsed, metadata = pickle.load(f)
+        except Exception:
+            return {}, {}
+
+        if not isinstance(parsed, dict) or not isinstance(metadata, dict):
+            return {}, {}
+        return parsed, metadata
+
+    def _save_parse_cache(self) -> None:
+        """Persist the parse cache atomically if it changed"""
+
+        if not self._parse_cache_dirty:
+            return
+
+        # Drop entries for files that are gone so the cache does not grow
+        # with every scenario ever seen
+        for cache in (self._parse_cache, self._metadata_cache):
+            for path in [p for p in cache if not p.exists()]:
+                del cache[path]
+
+        tmp_file = self.parse_cache_file.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            self.parse_cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_file, "wb") as f:
+                pickle.dump(
+                    (self._parse_cache, self._metadata_cache),
+                    f,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+            os.replace(tmp_file, self.parse_cache_file)
+            self._parse_cache_dirty = False
+        except Exception as e:
+            print(f"Warning: Could not save parse cache: {e}")
+
+    def _scan_dir(self, directory: Path) -> List[Path]:
+        """List scenario files in a directory, rescanning only when it changes"""
+
+        mtime_ns = directory.stat().st_mtime_ns
+        cached = self._glob_cache.get(directory)
+        if cached and cached[0] == mtime_ns:
+            return cached[1]
+
+        paths = list(directory.glob("*.yaml"))
+        self._glob_cache[directory] = (mtime_ns, paths)
+        return paths
+
+    def _invalidate_cache(self, path: Path) -> None:
+        """Drop any cached parse, index entry and ID mapping for a path.
+
+        The index on disk is left as is; entries are checked against the
+        file's mtime and size, so a stale one is never served.
+        """
+
+        path = Path(path)
+        if self._parse_cache.pop(path, None) is not None:
+            self._parse_cache_dirty = True
+        if self._metadata_cache.pop(path, None) is not None:
+            self._parse_cache_dirty = True
+        self._glob_cache.pop(path.parent, None)
+        if self._file_index is not None:
+            self._file_index.pop(str(path), None)
+        if self._id_to_path is not None:
+            for scenario_id in [i for i, p in self._id_to_path.items() if p == path]:
+                del self._id_to_path[scenario_id]
+        for key in [k for k in self._search_haystack if k[0] == str(path)]:
+            del self._search_haystack[key]
+
+    def _load_index(self) -> Dict[str, Dict]:
+        """Load the per-file metadata index from disk once per process"""
+
+        if self._file_index is None:
+            try:
+                if msgspec is not None and self.binary_index_file.exists():
+                    index = _INDEX_DECODER.decode(self.binary_index_file.read_bytes())
+                    self._file_index = {
+                        path: msgspec.structs.asdict(entry)
+                        for path, entry in index.files.items()
+                    }
+                else:
+                    self._file_index = _read_json(self.index_file).get("files", {})
+            except Exception:
+                self._file_index = {}
+
+        return self._file_index
+
+    def _get_metadata(self, path: Path) -> Dict:
+        """Get scenario metadata, parsing the YAML only if the index is stale.
+
+        On an index miss, a fresh full parse or metadata parse is reused if
+        one is cached; otherwise only the metadata block is parsed and
+        cached, with a full parse as the fallback when that block cannot be
+        isolated.
+        """
+
+        st = path.stat()
+        entry = self._load_index().get(str(path))
+        if (
+            entry
+            and entry.get("mtime_ns") == st.st_mtime_ns
+            and entry.get("size") == st.st_size
+        ):
+            return copy.deepcopy(entry["metadata"])
+
+        cached = self._parse_cache.get(path)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return copy.deepcopy(cached[2]["scenario_metadata"])
+
+        cached = self._metadata_cache.get(path)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return copy.deepcopy(cached[2])
+
+        metadata = _read_metadata(path, st.st_size)
+        if metadata is None:
+            return copy.deepcopy(self._load_yaml_cached(path)["scenario_metadata"])
+
+        self._metadata_cache[path] = (st.st_mtime_ns, st.st_size, metadata)
+        self._parse_cache_dirty = True
+        return copy.deepcopy(metadata)
+
+    def _map_files(
+        self, func: Callable[[Path], Any], paths: List[Path], prefetch: bool = False
+    ) -> List[Tuple[Any, Optional[Exception]]]:
+        """Apply func to each path on a thread pool, capturing per-file errors.
+
+        With prefetch, files missing from the parse cache get a readahead hint
+        up front so their reads overlap with parsing of earlier files.
+        """
+
+        if prefetch:
+            for path in paths:
+                if path not in self._parse_cache:
+                    _prefetch(path)
+
+        def call(path: Path) -> Tuple[Any, Optional[Exception]]:
+            try:
+                return func(path), None
+            except Exception as e:
+                return None, e
+
+        if len(paths) <= 1:
+            return [call(p) for p in paths]
+
+        with ThreadPoolExecutor(max_workers=min(32, len(paths))) as executor:
+            return list(executor.map(call, paths))
+
     def list_scenarios(
         self, library_only: bool = False, generated_only: bool = False
     ) -> List[Dict]:
         """List all available scenarios with metadata"""
 
-        scenarios = []
-
+        sources = []
         if not generated_only:
-            # Library scenarios
-            for scenario_file in self.library_dir.glob("*.yaml"):
-                try:
-                    with open(scenario_file, "r") as f:
-                        scenario = yaml.safe_load(f)
-                    scenarios.append(
-                        {
-                            "file_path": str(scenario_file),
-                            "metadata": scenario["scenario_metadata"],
-                            "is_library": True,
-                        }
-                    )
-                except Exception as e:
-                    print(f"Warning: Could not load {scenario_file}: {e}")
-
+            sources.append((self.library_dir, True))
         if not library_only:
-            # Generated scenarios
-            for scenario_file in self.generated_dir.glob("*.yaml"):
-                try:
-                    with open(scenario_file, "r") as f:
-                        scenario = yaml.safe_load(f)
-                    scenarios.append(
-                        {
-                            "file_path": str(scenario_file),
-                            "metadata": scenario["scenario_metadata"],
-                            "is_library": False,
-                        }
-                    )
-                except Exception as e:
-                    print(f"Warning: Could not load {scenario_file}: {e}")
+            sources.append((self.generated_dir, False))
+
+        scenario_files = [
+            (scenario_file, is_library)
+            for directory, is_library in sources
+            for scenario_file in self._scan_dir(directory)
+        ]
+
+        # Load metadata concurrently; results come back in input order
+        loaded = self._map_files(self._get_metadata, [p for p, _ in scenario_files])
+
+        scenarios = []
+        for (scenario_file, is_library), (metadata, error) in zip(
+            scenario_files, loaded
+        ):
+            if error is not None:
+                print(f"Warning: Could not load {scenario_file}: {error}")
+                continue
+            entry = {
+                "file_path": str(scenario_file),
+                "metadata": metadata,
+                "is_library": is_library,
+            }
+            # Position breaks ties so equal names never compare the dicts
+            scenarios.append((metadata["name"], len(scenarios), entry))
 
         # Sort by name
-        scenarios.sort(key=lambda x: x["metadata"]["name"])
+        scenarios.sort()
 
-        return scenarios
+        return [entry for _, _, entry in scenarios]
 
     def get_scenario(self, scenario_id: str) -> Optional[Dict]:
-        """Get a specific scenario by ID"""
+        """Get a specific scenario by ID.
 
-        scenarios = self.list_scenarios()
+        Returns a copy, so callers may modify it without touching the cache.
+        """
 
-        for scenario_data in scenarios:
-            if scenario_data["metadata"]["id"] == scenario_id:
-                with open(scenario_data["file_path"], "r") as f:
-                    return yaml.safe_load(f)
+        scenario_path = self._find_scenario_path(scenario_id)
+        if scenario_path is None:
+            return None
 
-        return None
+        return copy.deepcopy(self._load_yaml_cached(scenario_path))
+
+    def _find_scenario_path(self, scenario_id: str) -> Optional[Path]:
+        """Resolve a scenario ID to its file path via the id->path map.
+
+        The map is rebuilt from list_scenarios on a miss or when the cached
+        path no longer holds that scenario.
+        """
+
+        if self._id_to_path is not None:
+            scenario_path = self._id_to_path.get(scenario_id)
+            if scenario_path is not None:
+                try:
+                    if self._get_metadata(scenario_path)["id"] == scenario_id:
+                        return scenario_path
+                except Exception:
+                    pass
+
+        # First match in list order wins, as with a linear scan
+        self._id_to_path = {}
+        for scenario_data in self.list_scenarios():
+            self._id_to_path.setdefault(
+                scenario_data["metadata"]["id"], Path(scenario_data["file_path"])
+            )
+
+        return self._id_to_path.get(scenario_id)
 
     def validate_scenario(self, scenario_file: str) -> Tuple[bool, List[str]]:
         """Validate a scenario file against the template schema"""
 
-        errors = []
-
         try:
-            with open(scenario_file, "r") as f:
-                scenario = yaml.safe_load(f)
+            scenario = self._load_yaml_cached(Path(scenario_file))
         except Exception as e:
             return False, [f"Failed to parse YAML: {e}"]
 
-        # Check required top-level sections
-        required_sections = [
-            "scenario_metadata",
-            "attack_overview",
-            "initial_alert",
-        ]
+        return self._validate_dict(scenario)
+
+    def validate_scenarios(
+        self, scenario_files: List[str]
+    ) -> List[Tuple[Optional[Tuple[bool, List[str]]], Optional[Exception]]]:
+        """Validate several scenario files concurrently.
+
+        Results come back in input order as (result, error) pairs, where
+        result is the validate_scenario tuple and error is set instead if
+        validation raised.
+        """
+
+        return self._map_files(
+            self.validate_scenario, [Path(p) for p in scenario_files], prefetch=True
+        )
 
-        for section in required_sections:
+    def _validate_dict(self, scenario: Dict) -> Tuple[bool, List[str]]:
+        """Validate an already parsed scenario against the template schema"""
+
+        errors = []
+
+        # Fast path: the compiled schema accepts valid scenarios outright
+        if _VALIDATE is not None:
+            try:
+                _VALIDATE(scenario)
+                return True, []
+            except fastjsonschema.JsonSchemaException:
+                pass
+
+        # Check required top-level sections
+        for section in _REQUIRED_SECTIONS:
             if section not in scenario:
                 errors.append(f"Missing required section: {section}")
 
         # Validate scenario_metadata
         if "scenario_metadata" in scenario:
             metadata = scenario["scenario_metadata"]
-            required_metadata_fields = [
-                "name",
-                "id",
-                "version",
-                "environment",
-                "difficulty",
-            ]
-
-            for field in required_metadata_fields:
+            for field in _REQUIRED_METADATA_FIELDS:
                 if field not in metadata:
                     errors.append(f"Missing required metadata field: {field}")
 
@@ -121,21 +668,10 @@ class ScenarioManager:
                 env = metadata["environment"]
                 if "sector" not in env:
                     errors.append("Missing environment.sector")
-                elif env["sector"] not in [
-                    "finance",
-                    "healthcare",
-                    "government",
-                    "technology",
-                    "retail",
-                    "energy",
-                    "manufacturing",
-                    "education",
-                    "transportation",
-                    "utilities",
-                    "telecommunications",
-                    "media",
-                    "defense",
-                ]:
+                elif (
+                    not isinstance(env["sector"], str)
+                    or env["sector"] not in _VALID_SECTORS
+                ):
                     errors.append(f"Invalid sector: {env['sector']}")
 
                 if "organization" not in env:
@@ -151,26 +687,26 @@ class ScenarioManager:
             kill_chain = scenario["attack_overview"]["kill_chain"]
             if isinstance(kill_chain, list):
                 # New format: list of phases with phase, description, techniques
+                errors_append = errors.append
                 for phase_item in kill_chain:
                     if not isinstance(phase_item, dict):
-                        errors.append(
+                        errors_append(
                             f"Kill chain phase must be a dictionary: {phase_item}"
                         )
                         continue
 
-                    required_fields = ["phase", "description"]
-                    for field in required_fields:
-                        if field not in phase_item:
-                            errors.append(f"Missing {field} in kill_chain phase")
+                    missing = _REQUIRED_PHASE_SET.difference(phase_item)
+                    if missing:
+                        for field in _REQUIRED_PHASE_FIELDS:
+                            if field in missing:
+                                errors_append(f"Missing {field} in kill_chain phase")
             else:
                 errors.append("attack_overview.kill_chain must be a list")
 
         # Validate initial_alert
         if "initial_alert" in scenario:
             alert = scenario["initial_alert"]
-            required_alert_fields = ["alert_type", "timestamp", "description"]
-
-            for field in required_alert_fields:
+            for field in _REQUIRED_ALERT_FIELDS:
                 if field not in alert:
                     errors.append(f"Missing {field} in initial_alert")
 
@@ -183,33 +719,33 @@ class ScenarioManager:
             generated_only=False if include_generated else True
         )
 
-        stats = {
-            "total": len(scenarios),
-            "library_count": len([s for s in scenarios if s["is_library"]]),
-            "generated_count": len([s for s in scenarios if not s["is_library"]]),
-            "by_sector": defaultdict(int),
-            "by_difficulty": defaultdict(int),
-            "by_inspiration": defaultdict(int),
-        }
+        library_count = 0
+        by_sector = Counter()
+        by_difficulty = Counter()
+        by_inspiration = Counter()
 
         for scenario in scenarios:
             meta = scenario["metadata"]
 
-            # Count by sector
-            stats["by_sector"][meta["environment"]["sector"]] += 1
+            if scenario["is_library"]:
+                library_count += 1
 
-            # Count by difficulty
-            stats["by_difficulty"][meta["difficulty"]] += 1
+            by_sector[meta["environment"]["sector"]] += 1
+            by_difficulty[meta["difficulty"]] += 1
 
-            # Count by inspiration
             inspiration = meta.get("inspiration", {})
             if inspiration and inspiration.get("attack_name"):
-                stats["by_inspiration"][inspiration["attack_name"]] += 1
+                by_inspiration[inspiration["attack_name"]] += 1
 
-        # Convert defaultdicts to regular dicts for JSON serialization
-        stats["by_sector"] = dict(stats["by_sector"])
-        stats["by_difficulty"] = dict(stats["by_difficulty"])
-        stats["by_inspiration"] = dict(stats["by_inspiration"])
+        # Plain dicts for JSON serialization
+        stats = {
+            "total": len(scenarios),
+            "library_count": library_count,
+            "generated_count": len(scenarios) - library_count,
+            "by_sector": dict(by_sector),
+            "by_difficulty": dict(by_difficulty),
+            "by_inspiration": dict(by_inspiration),
+        }
 
         return stats
 
@@ -225,12 +761,13 @@ class ScenarioManager:
 
         if output_format.lower() == "json":
             output_file = export_dir / f"{scenario_id}.json"
-            with open(output_file, "w") as f:
-                json.dump(scenario, f, indent=2, default=str)
+            _write_json(output_file, scenario, indent=True)
         elif output_format.lower() == "yaml":
             output_file = export_dir / f"{scenario_id}.yaml"
             with open(output_file, "w") as f:
-                yaml.dump(scenario, f, default_flow_style=False, indent=2)
+                yaml.dump(
+                    scenario, f, Dumper=_DUMPER, default_flow_style=False, indent=2
+                )
         else:
             raise ValueError(f"Unsupported format: {output_format}")
 
@@ -245,15 +782,16 @@ class ScenarioManager:
         if not source_path.exists():
             raise FileNotFoundError(f"Scenario file not found: {scenario_file}")
 
-        # Validate before importing
-        is_valid, errors = self.validate_scenario(scenario_file)
+        # Parse once, then validate and read the ID from the same data
+        try:
+            scenario = self._load_yaml_cached(source_path)
+        except Exception as e:
+            raise ValueError(f"Invalid scenario file: Failed to parse YAML: {e}")
+
+        is_valid, errors = self._validate_dict(scenario)
         if not is_valid:
             raise ValueError(f"Invalid scenario file: {'; '.join(errors)}")
 
-        # Load to get ID
-        with open(scenario_file, "r") as f:
-            scenario = yaml.safe_load(f)
-
         scenario_id = scenario["scenario_metadata"]["id"]
 
         if destination == "library":
@@ -262,23 +800,23 @@ class ScenarioManager:
             dest_path = self.generated_dir / f"{scenario_id.lower()}.yaml"
 
         # Copy file
-        import shutil
-
-        shutil.copy2(source_path, dest_path)
+        _fast_copy(source_path, dest_path)
+        self._invalidate_cache(dest_path)
+        if self._id_to_path is not None:
+            self._id_to_path.setdefault(scenario_id, dest_path)
 
         return True
 
     def delete_scenario(self, scenario_id: str) -> bool:
         """Delete a scenario file"""
 
-        scenarios = self.list_scenarios()
+        scenario_path = self._find_scenario_path(scenario_id)
+        if scenario_path is None:
+            return False
 
-        for scenario_data in scenarios:
-            if scenario_data["metadata"]["id"] == scenario_id:
-                Path(scenario_data["file_path"]).unlink()
-                return True
-
-        return False
+        scenario_path.unlink()
+        self._invalidate_cache(scenario_path)
+        return True
 
     def search_scenarios(
         self, query: str, search_fields: List[str] = None
@@ -289,41 +827,49 @@ class ScenarioManager:
             search_fields = ["name", "description", "sector", "inspiration.attack_name"]
 
         scenarios = self.list_scenarios()
-        results = []
-
+        fields = tuple(search_fields)
         query_lower = query.lower()
 
-        for scenario in scenarios:
-            meta = scenario["metadata"]
-            match_found = False
+        return [
+            scenario
+            for scenario in scenarios
+            if query_lower in self._get_haystack(scenario, fields)
+        ]
 
-            # Search in specified fields
-            for field in search_fields:
-                field_value = self._get_nested_field(meta, field)
-                if field_value and query_lower in str(field_value).lower():
-                    match_found = True
-                    break
+    def _get_haystack(self, scenario: Dict, fields: Tuple[str, ...]) -> str:
+        """Get the lowercased searchable text for a scenario's fields.
+
+        Field values are joined with NUL so a query cannot match across two
+        fields. Entries are reused while the scenario's metadata is unchanged.
+        """
+
+        meta = scenario["metadata"]
+        key = (scenario["file_path"], fields)
+        cached = self._search_haystack.get(key)
+        if cached and cached[0] is meta:
+            return cached[1]
 
-            if match_found:
-                results.append(scenario)
+        values = []
+        for getter in map(_compile_path, fields):
+            field_value = getter(meta)
+            if field_value:
+                values.append(str(field_value).lower())
 
-        return results
+        haystack = "\0".join(values)
+        self._search_haystack[key] = (meta, haystack)
+        return haystack
 
     def _get_nested_field(self, data: Dict, field_path: str) -> Any:
         """Get nested field value using dot notation"""
 
-        fields = field_path.split(".")
-        value = data
+        return _compile_path(field_path)(data)
 
-        try:
-            for field in fields:
-                value = value[field]
-            return value
-        except (KeyError, TypeError):
-            return None
+    def create_scenario_index(self, export_json: bool = False) -> Dict[str, Any]:
+        """Create a searchable index of all scenarios.
 
-    def create_scenario_index(self) -> Dict[str, Any]:
-        """Create a searchable index of all scenarios"""
+        The index is saved as msgpack when msgspec is installed; pass
+        export_json to also write the human-readable index.json.
+        """
 
         scenarios = self.list_scenarios()
         index = {
@@ -333,13 +879,27 @@ class ScenarioManager:
             "attack_inspirations": set(),
             "techniques": set(),
         }
+        files = {}
 
-        for scenario_data in scenarios:
-            meta = scenario_data["metadata"]
+        # Load full scenarios concurrently to get techniques
+        scenario_paths = [Path(s["file_path"]) for s in scenarios]
+        loaded = self._map_files(self._load_yaml_cached, scenario_paths, prefetch=True)
 
-            # Load full scenario to get techniques
-            with open(scenario_data["file_path"], "r") as f:
-                full_scenario = yaml.safe_load(f)
+        for scenario_data, scenario_path, (full_scenario, error) in zip(
+            scenarios, scenario_paths, loaded
+        ):
+            if error is not None:
+                print(f"Warning: Could not load {scenario_path}: {error}")
+                continue
+
+            meta = scenario_data["metadata"]
+            st = scenario_path.stat()
+            files[scenario_data["file_path"]] = {
+                "mtime_ns": st.st_mtime_ns,
+                "size": st.st_size,
+                "is_library": scenario_data["is_library"],
+                "metadata": meta,
+            }
 
             scenario_index = {
                 "id": meta["id"],
@@ -373,10 +933,14 @@ class ScenarioManager:
         index["difficulties"] = list(index["difficulties"])
         index["attack_inspirations"] = list(index["attack_inspirations"])
         index["techniques"] = list(index["techniques"])
+        index["files"] = files
 
         # Save index
-        index_file = Path("scenarios/index.json")
-        with open(index_file, "w") as f:
-            json.dump(index, f, indent=2)
+        if msgspec is not None:
+            typed_index = msgspec.convert(index, ScenarioIndex)
+            self.binary_index_file.write_bytes(_INDEX_ENCODER.encode(typed_index))
+        if export_json or msgspec is None:
+            _write_json(self.index_file, index, indent=True)
+        self._file_index = files
 
         return index
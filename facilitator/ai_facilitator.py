@@ -3,33 +3,468 @@ AI Facilitator for Incidenter
 Provides LLM-powered game facilitation for cybersecurity incident response scenarios
 """
 
+import asyncio
+import hashlib
+import io
+import json
 import os
+import random
+import re
+import threading
+import time
+import uuid
 import logging
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from importlib.util import find_spec
+from types import MappingProxyType
+from typing import Callable, Dict, Iterator, List, Optional, Any, Tuple, Union
+from dataclasses import dataclass
+from functools import lru_cache
+
+import yaml
 
 try:
-    import openai
+    from yaml import CSafeLoader as _YAML_LOADER
 except ImportError:
-    openai = None
+    from yaml import SafeLoader as _YAML_LOADER
 
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
 
-try:
-    from google import genai
+def _module_available(name: str) -> bool:
+    """Check whether a module is installed without importing it"""
+    try:
+        return find_spec(name) is not None
+    except ImportError:
+        return False
+
+
+# The provider SDKs and Rich are imported on first use; checking for them
+# here keeps importing this module cheap for callers that never touch them
+VERTEX_AI_AVAILABLE = _module_available("google.genai")
+OPENAI_AVAILABLE = _module_available("openai")
+
+
+@lru_cache(maxsize=None)
+def _genai_types():
+    """Import google.genai.types on first use"""
     from google.genai import types
 
-    VERTEX_AI_AVAILABLE = True
-except ImportError:
-    VERTEX_AI_AVAILABLE = False
+    return types
+
+
+@lru_cache(maxsize=None)
+def _openai():
+    """Import openai on first use, or None if it is not installed"""
+    try:
+        import openai
+    except ImportError:
+        return None
+    return openai
+
+
+@lru_cache(maxsize=None)
+def _openai_errors() -> Optional[Tuple[type, type, type]]:
+    """
+    Resolve the openai.error classes used to classify validation failures
+
+    Returns:
+        (rate limit, authentication, base) error classes, or None if the
+        installed openai library does not have the pre-1.0 error module
+    """
+    error = getattr(_openai(), "error", None)
+    try:
+        return error.RateLimitError, error.AuthenticationError, error.OpenAIError
+    except AttributeError:
+        return None
 
-from rich.console import Console
-from rich.panel import Panel
-from rich.text import Text
 
-console = Console()
+@lru_cache(maxsize=None)
+def _get_console():
+    """Get the shared Rich console, importing Rich on first use"""
+    from rich.console import Console
 
+    return Console()
 
-@dataclass
+
+# Loose shape check for API keys; the key itself is verified on first use
+_API_KEY_PATTERN = re.compile(r"^[\w.-]{20,}$")
+
+# Scenario-independent part of the facilitator system prompt. It is identical
+# for every request, which makes it eligible for Gemini context caching.
+_SYSTEM_INSTRUCTIONS = """You are an expert cybersecurity incident response facilitator running a tabletop exercise.
+
+Your role is to:
+1. Guide players through investigating a cybersecurity incident
+2. Provide realistic, well-formatted responses to investigation actions
+3. Describe what investigators would observe during their actions
+4. When theories are provided, offer constructive feedback
+5. Maintain immersion while being educational
+
+IMPORTANT FORMATTING GUIDELINES:
+- Format responses clearly with proper paragraph breaks
+- Use bullet points or numbered lists when appropriate
+- Structure responses logically (what you observe, what it means)
+- Write for display in a web interface chat format
+- Keep responses concise but informative (2-4 paragraphs typically)
+
+EVIDENCE DISCOVERY GUIDELINES:
+- DO NOT acknowledge the user prompt.  Respond as if you are the facilitator.
+- Do NOT announce "Evidence discovered!" in your responses
+- If the user does not provide semantically meaningful text, DO NOT reveal evidence
+- The evidence discovery system handles finding evidence separately
+- Focus on describing what the investigation reveals, not on evidence mechanics
+- DO NOT reveal evidence unless the player specifically asks for it
+- Describe investigation findings realistically
+
+"""
+
+# Static segments of the per-request prompt templates. The builders join them
+# with the request-specific values instead of re-rendering whole f-strings.
+_ACTION_PROMPT_PARTS = (
+    "Player is taking investigation action: ",
+    "\nDetails: ",
+    "\n\n",
+    """
+
+Provide a realistic response about what the player discovers during this investigation action. Your response should:
+
+1. Describe what the investigation reveals - Be specific and realistic
+2. Format your response clearly - Use proper structure and formatting including line breaks for readability
+3. Only mention new evidence if it's directly relevant - Not every action should reveal evidence
+4. Be educational and informative - Help the player understand cybersecurity concepts
+5. Maintain realism - Don't reveal everything at once
+
+Important: The evidence discovery system handles finding new evidence separately.
+Focus on describing the investigation process and what would be observed, not on announcing evidence discoveries.
+
+Format your response with clear sections if appropriate, using proper paragraph breaks and structure for readability in a web interface.
+""",
+)
+
+_THEORY_PROMPT_PARTS = (
+    'Player has submitted this theory about the incident:\n"',
+    '"\n\nScenario context: ',
+    """
+
+Evaluate this theory and provide:
+1. What aspects are correct or on the right track
+2. What might need refinement or additional investigation
+3. Constructive feedback to guide further investigation
+4. Whether this theory demonstrates good understanding of the incident
+
+Be supportive but accurate. Don't give away the complete answer.
+""",
+)
+
+_HINT_PROMPT_PARTS = (
+    "Player is requesting a hint. Context: ",
+    "\n\nCurrent investigation status:\n- Actions taken: ",
+    "\n- Evidence found: ",
+    "\n- Theories submitted: ",
+    """
+
+Provide a helpful hint that:
+1. Guides them toward productive investigation
+2. Doesn't give away the answer
+3. Suggests specific investigation techniques or areas to explore
+4. Maintains the challenge level
+
+Keep it concise and actionable.
+""",
+)
+
+_SCENARIO_PROMPT_PARTS = (
+    """You are an expert cybersecurity scenario designer with deep knowledge of:
+- Historical cyberattacks and threat actor TTPs
+- MITRE ATT&CK framework and kill chain methodology
+- Forensic evidence and digital artifact analysis
+- Incident response procedures and investigation techniques
+- Red teaming and penetration testing methodologies
+
+Your task is to generate realistic, educational cybersecurity incident scenarios that:
+1. Are technically accurate and forensically sound
+2. Follow established attack patterns and TTPs
+3. Include realistic evidence and artifacts
+4. Provide appropriate challenge level for the specified difficulty
+5. Include compelling red herrings to increase realism
+6. Map to MITRE ATT&CK techniques
+
+Generate scenarios in valid YAML format following the provided template structure exactly.
+
+""",
+    """
+
+IMPORTANT GUIDELINES:
+- Return only valid YAML content, no additional text or markdown
+- Ensure all MITRE technique IDs are valid (format: T####)
+- Include realistic technical details (IPs, domains, file hashes, etc.)
+- Make evidence discoverable through logical investigation steps
+- Balance difficulty appropriately for the specified complexity level
+- Include 25% red herrings that are plausible but misleading
+- All fictional organizations, domains, and data should be clearly fake
+""",
+)
+
+# Scenario returned when AI scenario generation fails
+_FALLBACK_SCENARIO_YAML = """scenario_metadata:
+  name: "Generic Phishing Incident"
+  id: "FALLBACK-001"
+  version: "1.0"
+  inspiration:
+    attack_name: "Generic Phishing"
+    year: 2024
+    attribution: "Unknown"
+    references: []
+  environment:
+    sector: "technology"
+    organization_size: "medium"
+    infrastructure: "hybrid"
+  difficulty: "intermediate"
+  estimated_duration: "2-3 hours"
+  description: "A phishing campaign targeting employee credentials leads to unauthorized access."
+
+attack_overview:
+  summary: "Attackers used spear-phishing emails to steal credentials and gain initial access to corporate systems."
+  attack_type: "credential_theft"
+  sophistication_level: "medium"
+  objectives:
+    primary: "Credential harvesting"
+    secondary: "Data exfiltration"
+
+initial_alert:
+  timestamp: "2024-06-25T14:30:00Z"
+  source: "Email Security Gateway"
+  alert_type: "Suspicious email detected"
+  description: "Multiple employees reported receiving suspicious emails requesting credential verification."
+  initial_indicators:
+    - "Phishing emails from external domain"
+    - "Suspicious login attempts"
+    - "Unusual network traffic"
+
+timeline:
+  start: "2024-06-25T08:00:00Z"
+  discovery: "2024-06-25T14:30:00Z"
+  phases:
+    - phase: "Initial Access"
+      mitre_id: "T1566"
+      start_time: "2024-06-25T08:00:00Z"
+      duration: "6 hours"
+      description: "Phishing campaign launched"
+
+evidence:
+  items:
+    - id: "FALLBACK-E001"
+      type: "email"
+      source: "mail_server"
+      importance: "critical"
+      description: "Phishing email with malicious link"
+
+kill_chain:
+  phases:
+    - name: "Initial Access"
+      mitre_id: "T1566"
+      techniques: ["T1566.002"]
+      description: "Spearphishing link"
+
+scoring:
+  total_points: 100
+  phases:
+    - name: "Initial Access"
+      points: 25
+      criteria: ["Identify phishing vector"]
+"""
+
+# Top-level sections a generated scenario must have to be usable
+_SCENARIO_SECTIONS = ("scenario_metadata", "attack_overview", "initial_alert")
+
+# Markdown code fence models sometimes wrap generated YAML in
+_CODE_FENCE = re.compile(r"^\s*```[\w-]*\n(.*?)\n```\s*$", re.DOTALL)
+
+# Keywords in a facilitator response that trigger follow-up suggestions
+# (or, for "question", mark the response as needing a follow-up). Each
+# keyword gets a bit; the suggestions for every combination of keywords are
+# precomputed so a response needs one scan and one table lookup.
+_KEYWORD_SUGGESTIONS = (
+    ("investigate", "Continue investigating based on this information"),
+    ("evidence", "Document any new evidence discovered"),
+    ("timeline", "Consider the timing of events"),
+    ("question", None),
+)
+_KEYWORD_BITS = {
+    keyword: 1 << i for i, (keyword, _) in enumerate(_KEYWORD_SUGGESTIONS)
+}
+_ALL_KEYWORDS_MASK = (1 << len(_KEYWORD_SUGGESTIONS)) - 1
+_FOLLOWUP_BIT = _KEYWORD_BITS["question"]
+_SUGGESTIONS_BY_MASK = tuple(
+    tuple(
+        suggestion
+        for i, (_, suggestion) in enumerate(_KEYWORD_SUGGESTIONS)
+        if suggestion and mask & (1 << i)
+    )
+    or ("Continue your investigation",)
+    for mask in range(_ALL_KEYWORDS_MASK + 1)
+)
+_RESPONSE_KEYWORDS = re.compile(
+    "|".join(keyword for keyword, _ in _KEYWORD_SUGGESTIONS), re.IGNORECASE
+)
+_CORRECT_KEYWORD = re.compile("correct", re.IGNORECASE)
+
+# Most frequent evidence types listed in an action prompt
+_MAX_PROMPT_EVIDENCE_TYPES = 10
+
+# Bounds on the facilitator's in-memory history. Once the action log passes
+# the compaction threshold, everything but the most recent actions is folded
+# into a single entry counting them.
+_HISTORY_WINDOW = 200
+_ACTION_COMPACT_THRESHOLD = 150
+_ACTION_KEEP_RECENT = 50
+_ACTION_SUMMARY = "summary of earlier actions"
+
+# Retry policy for transient provider failures (rate limits, overloaded
+# backends, dropped connections): exponential backoff with full jitter
+_RETRY_ATTEMPTS = 3
+_RETRY_INITIAL_DELAY = 0.5
+_RETRY_MAX_DELAY = 8.0
+_TRANSIENT_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+_TRANSIENT_ERROR_NAMES = frozenset(
+    {
+        "APIConnectionError",
+        "APITimeoutError",
+        "DeadlineExceeded",
+        "RateLimitError",
+        "ResourceExhausted",
+        "ServiceUnavailable",
+        "ServiceUnavailableError",
+        "Timeout",
+    }
+)
+
+# Credential and connection checks cost a provider round trip, so their
+# results are shared process-wide for a while. Failures are kept only briefly
+# so a fixed key is picked up quickly.
+_VALIDATION_TTL = 600.0
+_VALIDATION_FAILURE_TTL = 30.0
+_VALIDATION_CACHE: Dict[Tuple, Tuple[float, bool]] = {}
+_VALIDATION_LOCK = threading.Lock()
+
+# Static guidance logged alongside credential failures
+_OPENAI_VERSION_HINT = "Make sure you have the correct version of the openai library"
+_ADC_SCOPE_HINT = (
+    "ADC works best with service accounts that have proper AI platform scopes\n"
+    "For individual use, consider using GOOGLE_AI_API_KEY instead"
+)
+
+# Scalar fields of a facilitator's game context before a scenario is loaded
+_DEFAULT_GAME_CONTEXT = MappingProxyType(
+    {
+        "scenario_id": None,
+        "scenario_name": None,
+        "difficulty": "medium",
+        "attack_type": None,
+    }
+)
+
+# Sampling temperature unless deterministic responses are requested
+_DEFAULT_TEMPERATURE = 0.7
+
+# Deterministic (temperature 0) action responses kept per facilitator
+_RESPONSE_CACHE_SIZE = 256
+
+
+def _new_game_context() -> Dict[str, Any]:
+    """Build an empty game context with its own mutable containers"""
+    context = dict(_DEFAULT_GAME_CONTEXT)
+    context["timeline"] = {}
+    context["evidence_discovered"] = []
+    context["theories_submitted"] = []
+    context["investigation_actions"] = deque(maxlen=_HISTORY_WINDOW)
+    return context
+
+
+def _is_transient_error(error: Exception) -> bool:
+    """Check whether a provider SDK error is worth retrying"""
+    if type(error).__name__ in _TRANSIENT_ERROR_NAMES:
+        return True
+    return any(
+        getattr(error, attr, None) in _TRANSIENT_STATUS_CODES
+        for attr in ("code", "status_code", "http_status")
+    )
+
+
+def _is_auth_error(error: Exception) -> bool:
+    """Check whether a provider SDK error means the credentials were rejected"""
+    if type(error).__name__ in ("AuthenticationError", "PermissionDeniedError"):
+        return True
+    return any(
+        getattr(error, attr, None) in (401, 403)
+        for attr in ("code", "status_code", "http_status")
+    )
+
+
+def _cached_validation(key: Tuple) -> Optional[bool]:
+    """Get an unexpired validation result, or None"""
+    with _VALIDATION_LOCK:
+        entry = _VALIDATION_CACHE.get(key)
+    if entry is not None and time.monotonic() < entry[0]:
+        return entry[1]
+    return None
+
+
+def _store_validation(key: Tuple, ok: bool) -> bool:
+    """Remember a validation result and return it"""
+    ttl = _VALIDATION_TTL if ok else _VALIDATION_FAILURE_TTL
+    with _VALIDATION_LOCK:
+        _VALIDATION_CACHE[key] = (time.monotonic() + ttl, ok)
+    return ok
+
+
+def _forget_validations(provider: str):
+    """Drop cached validation results for a provider"""
+    with _VALIDATION_LOCK:
+        for key in [k for k in _VALIDATION_CACHE if k[0] == provider]:
+            del _VALIDATION_CACHE[key]
+
+
+def _retry_delay(attempt: int) -> float:
+    """Backoff before retry number attempt + 1"""
+    return random.uniform(0, min(_RETRY_MAX_DELAY, _RETRY_INITIAL_DELAY * 2**attempt))
+
+
+def _parse_generated_scenario(text: str) -> Dict[str, Any]:
+    """
+    Parse a generated scenario and check its top-level structure
+
+    Raises:
+        ValueError: If the text is not YAML/JSON or lacks required sections
+    """
+    fenced = _CODE_FENCE.match(text)
+    if fenced:
+        text = fenced.group(1)
+
+    try:
+        scenario = yaml.load(text, Loader=_YAML_LOADER)
+    except yaml.YAMLError as e:
+        raise ValueError(f"invalid YAML: {e}")
+
+    if not isinstance(scenario, dict):
+        raise ValueError("scenario must be a YAML mapping")
+
+    missing = [section for section in _SCENARIO_SECTIONS if section not in scenario]
+    if missing:
+        raise ValueError(f"missing required sections: {', '.join(missing)}")
+
+    return scenario
+
+
+@lru_cache(maxsize=None)
+def _get_vertex_client(project: str, location: str):
+    """Get a shared Vertex AI client so facilitators in one process reuse auth"""
+    from google import genai
+
+    return genai.Client(vertexai=True, project=project, location=location)
+
+
+@dataclass(slots=True, frozen=True)
 class FacilitatorResponse:
     """Response from the AI facilitator"""
 
@@ -40,61 +475,82 @@ class FacilitatorResponse:
     requires_followup: bool = False
 
 
+class FacilitatorProcessingError(RuntimeError):
+    """Raised when the facilitator could not produce a response"""
+
+
 class AIFacilitator:
     """AI-powered game facilitator for incident response scenarios"""
 
-    def __init__(self, provider: str = "google", model: str = None):
+    def __init__(
+        self,
+        provider: str = "google",
+        model: str = None,
+        validate_live: bool = False,
+        prefetch_hints: bool = False,
+        temperature: float = _DEFAULT_TEMPERATURE,
+    ):
         """
         Initialize the AI facilitator
 
         Args:
             provider: AI provider ("google" or "openai")
             model: Specific model to use (optional)
+            validate_live: Verify Google credentials with a test generation
+                request instead of checking them locally
+            prefetch_hints: After each action or theory, generate the default
+                hint in the background so a following provide_hint() call
+                can return without waiting on the provider
+            temperature: Sampling temperature for facilitation requests. At 0
+                responses are deterministic and repeated action prompts are
+                answered from a local cache
         """
         self.provider = provider.lower()
         self.model = model
+        self.validate_live = validate_live
+        self.prefetch_hints = prefetch_hints
+        self.temperature = temperature
+        self._pending_hint = None
+        self._hint_executor = None
         self.logger = logging.getLogger(__name__)
         self._client = None
+        self._project = os.getenv("GOOGLE_CLOUD_PROJECT", "")
         self._initialize_client()
+        self._init_game_state()
 
-        # Game context and memory
-        self.game_context = {
-            "scenario_id": None,
-            "scenario_name": None,
-            "difficulty": "medium",
-            "attack_type": None,
-            "timeline": {},
-            "evidence_discovered": [],
-            "theories_submitted": [],
-            "investigation_actions": [],
-        }
-        self.conversation_history = []
+    def _init_game_state(self):
+        """Set up the game context, memory and prompt caches"""
+        self.game_context = _new_game_context()
+        self.conversation_history = deque(maxlen=_HISTORY_WINDOW)
         self.scenario_data = {}
+        self._system_prompt_cache = None
+        self._system_prompt_key = None
+        self._action_seq = 0
+        self._theory_seq = 0
+        self._evidence_type_counts = Counter()
+        self._response_cache = OrderedDict()
 
     def _initialize_client(self):
         """Initialize the AI client based on provider"""
         if self.provider == "google" and VERTEX_AI_AVAILABLE:
-            # Validate GCP credentials before initializing client
+            self.model = self.model or "gemini-2.0-flash-001"
+
+            # Build (or reuse) the Vertex AI client once; the credential
+            # check below runs its test request through the same client
+            try:
+                self._client = _get_vertex_client(self._project, "global")
+            except Exception as e:
+                raise ValueError(f"Failed to initialize Google AI client: {e}")
+
             if not self._validate_gcp_credentials():
                 raise ValueError(
                     "Unable to authenticate with Google AI. Please set "
                     "GOOGLE_AI_API_KEY or run 'gcloud auth login --update-adc'"
                 )
 
-            self.model = self.model or "gemini-2.0-flash-001"
+            self.logger.info("Google AI client initialized successfully")
 
-            # Initialize Vertex AI client - credentials already validated
-            try:
-                self._client = genai.Client(
-                    vertexai=True,
-                    project=os.getenv("GOOGLE_CLOUD_PROJECT", ""),
-                    location="global",
-                )
-                self.logger.info("Google AI client initialized successfully")
-            except Exception as e:
-                raise ValueError(f"Failed to initialize Google AI client: {e}")
-
-        elif self.provider == "openai" and openai:
+        elif self.provider == "openai" and OPENAI_AVAILABLE:
             # Validate OpenAI credentials before initializing client
             if not self._validate_openai_credentials():
                 raise ValueError(
@@ -103,7 +559,7 @@ class AIFacilitator:
                 )
 
             self.model = self.model or "gpt-4"
-            self._client = openai
+            self._client = _openai()
             self.logger.info("OpenAI client initialized successfully")
 
         else:
@@ -121,9 +577,11 @@ class AIFacilitator:
             api_key = os.getenv("GOOGLE_AI_API_KEY")
             if api_key:
                 self.logger.info("Attempting API key authentication...")
-                # For Vertex AI, we still use API key through environment
-                os.environ["GOOGLE_AI_API_KEY"] = api_key
-                if self._test_vertex_ai_connection():
+                if self.validate_live:
+                    key_ok = self._test_vertex_ai_connection(client=self._client)
+                else:
+                    key_ok = bool(_API_KEY_PATTERN.match(api_key))
+                if key_ok:
                     self.logger.info("Vertex AI API key authentication successful")
                     return True
                 else:
@@ -144,10 +602,19 @@ class AIFacilitator:
                     self.logger.warning("No valid ADC credentials found")
                     return False
 
-                # Test Vertex AI connection with ADC
-                if self._test_vertex_ai_connection():
+                # Test Vertex AI connection with ADC, or just refresh the
+                # token locally unless a live check was requested
+                if self.validate_live:
+                    adc_ok = self._test_vertex_ai_connection(client=self._client)
+                else:
+                    from google.auth.transport.requests import Request
+
+                    credentials.refresh(Request())
+                    adc_ok = True
+
+                if adc_ok:
                     self.logger.info("Vertex AI ADC authentication successful")
-                    self.logger.info(f"Using project: {project}")
+                    self.logger.info("Using project: %s", project)
                     return True
                 else:
                     self.logger.warning(
@@ -163,49 +630,44 @@ class AIFacilitator:
                     self.logger.warning(
                         "ADC found but lacks required scopes for Google AI API"
                     )
-                    self.logger.info(
-                        "ADC works best with service accounts that have proper AI platform scopes"
-                    )
-                    self.logger.info(
-                        "For individual use, consider using GOOGLE_AI_API_KEY instead"
-                    )
+                    self.logger.info("%s", _ADC_SCOPE_HINT)
                 else:
-                    self.logger.warning(f"ADC authentication error: {adc_error}")
+                    self.logger.warning("ADC authentication error: %s", adc_error)
 
             # If both methods fail, provide helpful error message
-            self.logger.error("Vertex AI authentication failed")
-            self.logger.error("🔐 Authentication options:")
-            self.logger.error(
-                "1. 🔑 API Key (Recommended): Set GOOGLE_AI_API_KEY environment variable"
-            )
-            self.logger.error(
-                "   Get your key at: https://makersuite.google.com/app/apikey"
-            )
-            self.logger.error(
-                "2. 🌐 ADC (Advanced): Run 'gcloud auth login --update-adc'"
-            )
+            if self.logger.isEnabledFor(logging.ERROR):
+                self.logger.error(
+                    "Vertex AI authentication failed\n"
+                    "🔐 Authentication options:\n"
+                    "1. 🔑 API Key (Recommended): Set GOOGLE_AI_API_KEY environment variable\n"
+                    "   Get your key at: https://makersuite.google.com/app/apikey\n"
+                    "2. 🌐 ADC (Advanced): Run 'gcloud auth login --update-adc'"
+                )
             return False
 
         except Exception as e:
-            self.logger.error(f"GCP credential validation failed: {e}")
+            self.logger.error("GCP credential validation failed: %s", e)
             return False
 
-    def _test_vertex_ai_connection(self) -> bool:
+    def _test_vertex_ai_connection(self, client=None) -> bool:
         """
         Test the Vertex AI connection with current configuration
 
+        Args:
+            client: Vertex AI client to test (defaults to this facilitator's client)
+
         Returns:
             bool: True if connection is successful, False otherwise
         """
         try:
-            # Create a temporary Vertex AI client for testing
-            test_client = genai.Client(
-                vertexai=True,
-                project=os.getenv("GOOGLE_CLOUD_PROJECT", ""),
-                location="global",
+            test_client = (
+                client
+                or self._client
+                or _get_vertex_client(self._project, "global")
             )
 
             # Test with a minimal generation request
+            types = _genai_types()
             contents = types.Part.from_text(text="Test connection. Respond with 'OK'.")
 
             generate_content_config = types.GenerateContentConfig(
@@ -231,7 +693,7 @@ class AIFacilitator:
                 return False
 
         except Exception as e:
-            self.logger.error(f"Connection test failed: {e}")
+            self.logger.error("Connection test failed: %s", e)
             # Provide specific error guidance based on error type
             error_str = str(e).lower()
 
@@ -252,7 +714,7 @@ class AIFacilitator:
                     "Project-related error - check GOOGLE_CLOUD_PROJECT environment variable"
                 )
             else:
-                self.logger.error(f"Unexpected validation error: {e}")
+                self.logger.error("Unexpected validation error: %s", e)
 
             return False
 
@@ -267,89 +729,239 @@ class AIFacilitator:
             "timeline": scenario_data.get("timeline", {}),
             "evidence_discovered": [],
             "theories_submitted": [],
-            "investigation_actions": [],
+            "investigation_actions": deque(maxlen=_HISTORY_WINDOW),
         }
 
         # Reset conversation history for new scenario
-        self.conversation_history = []
+        self.conversation_history = deque(maxlen=_HISTORY_WINDOW)
+        self._system_prompt_cache = None
+        self._action_seq = 0
+        self._theory_seq = 0
+        self._evidence_type_counts.clear()
+        self._discard_prefetched_hint()
 
-        self.logger.info(f"Loaded scenario: {scenario_data.get('name')}")
+        self.logger.info("Loaded scenario: %s", scenario_data.get("name"))
 
     def get_system_prompt(self) -> str:
         """Generate system prompt for the AI facilitator"""
-        return f"""You are an expert cybersecurity incident response facilitator running a tabletop exercise.
-
-Your role is to:
-1. Guide players through investigating a cybersecurity incident
-2. Provide realistic, well-formatted responses to investigation actions
-3. Describe what investigators would observe during their actions
-4. When theories are provided, offer constructive feedback
-5. Maintain immersion while being educational
-
-IMPORTANT FORMATTING GUIDELINES:
-- Format responses clearly with proper paragraph breaks
-- Use bullet points or numbered lists when appropriate
-- Structure responses logically (what you observe, what it means)
-- Write for display in a web interface chat format
-- Keep responses concise but informative (2-4 paragraphs typically)
-
-EVIDENCE DISCOVERY GUIDELINES:
-- DO NOT acknowledge the user prompt.  Respond as if you are the facilitator.
-- Do NOT announce "Evidence discovered!" in your responses
-- If the user does not provide semantically meaningful text, DO NOT reveal evidence
-- The evidence discovery system handles finding evidence separately
-- Focus on describing what the investigation reveals, not on evidence mechanics
-- DO NOT reveal evidence unless the player specifically asks for it
-- Describe investigation findings realistically
+        # Only rebuild when one of the interpolated values has changed
+        key = (
+            self.scenario_data.get("name", "Unknown"),
+            self.scenario_data.get("attack_type", "Unknown"),
+            self.game_context.get("difficulty", "medium"),
+            len(self.game_context.get("evidence_discovered", [])),
+            len(self.game_context.get("theories_submitted", [])),
+        )
+        if self._system_prompt_cache is not None and key == self._system_prompt_key:
+            return self._system_prompt_cache
 
-Current Scenario: {self.scenario_data.get('name', 'Unknown')}
-Attack Type: {self.scenario_data.get('attack_type', 'Unknown')}
-Difficulty: {self.game_context.get('difficulty', 'medium')}
+        name, attack_type, difficulty, evidence_count, theory_count = key
+        self._system_prompt_key = key
+        context = f"""Current Scenario: {name}
+Attack Type: {attack_type}
+Difficulty: {difficulty}
 
-Evidence discovered so far: {len(self.game_context.get('evidence_discovered', []))} items
-Theories submitted: {len(self.game_context.get('theories_submitted', []))}
+Evidence discovered so far: {evidence_count} items
+Theories submitted: {theory_count}
 """
-
-    def facilitate_action(self, action: str, details: str = "") -> FacilitatorResponse:
+        self._system_prompt_cache = _SYSTEM_INSTRUCTIONS + context
+        return self._system_prompt_cache
+
+    def facilitate_action(
+        self,
+        action: str,
+        details: str = "",
+        on_token: Optional[Callable[[str], None]] = None,
+    ) -> FacilitatorResponse:
         """
         Facilitate a player investigation action
 
         Args:
             action: The investigation action being taken
             details: Additional details about the action
+            on_token: Optional callback; when given, the response is streamed
+                and each chunk is passed to it as it arrives
 
         Returns:
             FacilitatorResponse with AI-generated content
         """
         try:
-            # Update game context
-            self.game_context["investigation_actions"].append(
-                {
-                    "action": action,
-                    "details": details,
-                    "timestamp": len(self.game_context["investigation_actions"]) + 1,
-                }
-            )
+            return self._facilitate_action(action, details, on_token)
+        except FacilitatorProcessingError as e:
+            self.logger.error("Error facilitating action: %s", e.__cause__ or e)
+            return self._action_error_response()
+
+    def _facilitate_action(
+        self,
+        action: str,
+        details: str = "",
+        on_token: Optional[Callable[[str], None]] = None,
+    ) -> FacilitatorResponse:
+        """
+        Facilitate an action, raising instead of returning a fallback response
+
+        Raises:
+            FacilitatorProcessingError: If no response could be produced
+        """
+        try:
+            prompt = self._prepare_action(action, details)
 
-            # Build prompt
-            prompt = self._build_action_prompt(action, details)
+            # Deterministic requests can be answered from earlier responses
+            cache_key = None
+            response = None
+            if self.temperature == 0:
+                cache_key = (self.model, self.get_system_prompt(), prompt)
+                response = self._response_cache.get(cache_key)
 
             # Get AI response
-            response = self._get_ai_response(prompt)
+            if response is not None:
+                if cache_key is not None:
+                    self._response_cache.move_to_end(cache_key)
+                if on_token is not None:
+                    on_token(response)
+            elif on_token is None:
+                response = self._get_ai_response(prompt)
+            else:
+                buffer = io.StringIO()
+                for chunk in self._get_ai_response_stream(prompt):
+                    buffer.write(chunk)
+                    on_token(chunk)
+                response = buffer.getvalue()
+
+            if cache_key is not None and cache_key not in self._response_cache:
+                self._response_cache[cache_key] = response
+                if len(self._response_cache) > _RESPONSE_CACHE_SIZE:
+                    self._response_cache.popitem(last=False)
 
             # Process and return response
+            processed = self._process_response(response, action)
+            self._prefetch_hint()
+            return processed
+
+        except Exception as e:
+            raise FacilitatorProcessingError(f"Could not facilitate action: {e}") from e
+
+    def clear_cache(self):
+        """Forget cached action responses"""
+        self._response_cache.clear()
+
+    def stream_action(
+        self, action: str, details: str = "", title: str = "Facilitator"
+    ) -> FacilitatorResponse:
+        """Facilitate an action, rendering the response live as it streams"""
+        from rich.live import Live
+        from rich.panel import Panel
+        from rich.text import Text
+
+        streamed = Text()
+        panel = Panel(
+            streamed,
+            title=f"[bold blue]{title}[/bold blue]",
+            border_style="blue",
+            padding=(1, 2),
+        )
+
+        with Live(panel, console=_get_console(), refresh_per_second=8):
+            response = self.facilitate_action(action, details, on_token=streamed.append)
+
+        self._display_response_details(response)
+        return response
+
+    async def facilitate_actions_batch(
+        self, actions: List[Tuple[str, str]], max_concurrency: int = 4
+    ) -> List[FacilitatorResponse]:
+        """
+        Facilitate several investigation actions concurrently
+
+        Args:
+            actions: (action, details) pairs to facilitate
+            max_concurrency: Maximum number of AI requests in flight at once
+
+        Returns:
+            FacilitatorResponses in the same order as actions
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run(action: str, details: str) -> FacilitatorResponse:
+            async with semaphore:
+                return await self._facilitate_action_async(action, details)
+
+        return list(await asyncio.gather(*(run(a, d) for a, d in actions)))
+
+    async def _facilitate_action_async(
+        self, action: str, details: str = ""
+    ) -> FacilitatorResponse:
+        """Async counterpart of facilitate_action"""
+        try:
+            prompt = self._prepare_action(action, details)
+            response = await self._get_ai_response_async(prompt)
             return self._process_response(response, action)
 
         except Exception as e:
-            self.logger.error(f"Error facilitating action: {e}")
-            return FacilitatorResponse(
-                content="I encountered an issue processing your action. Please try rephrasing your investigation approach.",
-                confidence=0.0,
-                suggestions=[
-                    "Try a different investigation approach",
-                    "Check your network connection",
-                ],
-            )
+            self.logger.error("Error facilitating action: %s", e)
+            return self._action_error_response()
+
+    def _prepare_action(self, action: str, details: str) -> str:
+        """Record an investigation action and build its prompt"""
+        # Update game context
+        actions = self.game_context["investigation_actions"]
+        actions.append(
+            {
+                "action": action,
+                "details": details,
+                "timestamp": self._next_action_seq(),
+            }
+        )
+        if len(actions) > _ACTION_COMPACT_THRESHOLD:
+            self._compact_actions()
+
+        # Build prompt
+        return self._build_action_prompt(action, details)
+
+    def add_evidence(self, evidence: Dict[str, Any]):
+        """Record a discovered evidence item for use in later prompts"""
+        self.game_context["evidence_discovered"].append(evidence)
+        self._evidence_type_counts[evidence.get("type", "Unknown")] += 1
+
+    def _compact_actions(self):
+        """Fold all but the most recent actions into one entry counting them.
+
+        Runs inline on every path, including the async batch, so it makes
+        no model call.
+        """
+        actions = self.game_context["investigation_actions"]
+        older = [actions.popleft() for _ in range(len(actions) - _ACTION_KEEP_RECENT)]
+        count = sum(a.get("count", 1) for a in older)
+
+        actions.appendleft(
+            {
+                "action": _ACTION_SUMMARY,
+                "details": f"{count} earlier investigation actions",
+                "count": count,
+                "timestamp": older[-1]["timestamp"],
+            }
+        )
+
+    def _next_action_seq(self) -> int:
+        """Next investigation action number, independent of the stored history"""
+        self._action_seq += 1
+        return self._action_seq
+
+    def _next_theory_seq(self) -> int:
+        """Next theory number, independent of the stored history"""
+        self._theory_seq += 1
+        return self._theory_seq
+
+    def _action_error_response(self) -> FacilitatorResponse:
+        """Fallback response when an action could not be facilitated"""
+        return FacilitatorResponse(
+            content="I encountered an issue processing your action. Please try rephrasing your investigation approach.",
+            confidence=0.0,
+            suggestions=[
+                "Try a different investigation approach",
+                "Check your network connection",
+            ],
+        )
 
     def evaluate_theory(self, theory: str) -> FacilitatorResponse:
         """
@@ -366,7 +978,7 @@ Theories submitted: {len(self.game_context.get('theories_submitted', []))}
             self.game_context["theories_submitted"].append(
                 {
                     "theory": theory,
-                    "timestamp": len(self.game_context["theories_submitted"]) + 1,
+                    "timestamp": self._next_theory_seq(),
                 }
             )
 
@@ -377,10 +989,12 @@ Theories submitted: {len(self.game_context.get('theories_submitted', []))}
             response = self._get_ai_response(prompt)
 
             # Process response
-            return self._process_theory_response(response, theory)
+            processed = self._process_theory_response(response, theory)
+            self._prefetch_hint()
+            return processed
 
         except Exception as e:
-            self.logger.error(f"Error evaluating theory: {e}")
+            self.logger.error("Error evaluating theory: %s", e)
             return FacilitatorResponse(
                 content="I need a moment to process your theory. Please try again.",
                 confidence=0.0,
@@ -390,8 +1004,10 @@ Theories submitted: {len(self.game_context.get('theories_submitted', []))}
     def provide_hint(self, context: str = "") -> FacilitatorResponse:
         """Provide a helpful hint to players"""
         try:
-            prompt = self._build_hint_prompt(context)
-            response = self._get_ai_response(prompt)
+            response = None if context else self._take_prefetched_hint()
+            if response is None:
+                prompt = self._build_hint_prompt(context)
+                response = self._get_ai_response(prompt)
 
             return FacilitatorResponse(
                 content=response,
@@ -401,7 +1017,7 @@ Theories submitted: {len(self.game_context.get('theories_submitted', []))}
             )
 
         except Exception as e:
-            self.logger.error(f"Error providing hint: {e}")
+            self.logger.error("Error providing hint: %s", e)
             return FacilitatorResponse(
                 content="Try examining the timeline of events more carefully.",
                 confidence=0.5,
@@ -411,17 +1027,73 @@ Theories submitted: {len(self.game_context.get('theories_submitted', []))}
                 ],
             )
 
-    def generate_scenario(self, prompt: str) -> str:
+    def _hint_state(self) -> Tuple[int, int, int]:
+        """Investigation progress that the default hint prompt depends on"""
+        return (
+            self._action_seq,
+            self._theory_seq,
+            len(self.game_context.get("evidence_discovered", [])),
+        )
+
+    def _prefetch_hint(self):
+        """Start generating the default hint in the background"""
+        self._discard_prefetched_hint()
+        if not self.prefetch_hints:
+            return
+
+        if self._hint_executor is None:
+            self._hint_executor = ThreadPoolExecutor(max_workers=1)
+
+        # Both prompts are built here so the worker only talks to the provider
+        system_prompt = self.get_system_prompt()
+        future = self._hint_executor.submit(
+            self._get_ai_response, self._build_hint_prompt(""), system_prompt
+        )
+        self._pending_hint = (self._hint_state(), system_prompt, future)
+
+    def _take_prefetched_hint(self) -> Optional[str]:
+        """Claim the prefetched hint if it still matches the game state"""
+        pending, self._pending_hint = self._pending_hint, None
+        if pending is None:
+            return None
+
+        state, system_prompt, future = pending
+        if state != self._hint_state() or system_prompt != self.get_system_prompt():
+            future.cancel()
+            return None
+
+        try:
+            return future.result()
+        except Exception as e:
+            self.logger.debug("Prefetched hint failed: %s", e)
+            return None
+
+    def _discard_prefetched_hint(self):
+        """Drop a prefetched hint that is no longer wanted"""
+        if self._pending_hint is not None:
+            self._pending_hint[-1].cancel()
+            self._pending_hint = None
+
+    def generate_scenario(
+        self, prompt: str, return_dict: bool = False
+    ) -> Union[str, Dict[str, Any], None]:
         """
         Generate a new cybersecurity incident scenario using AI.
 
         Args:
             prompt: Detailed prompt for scenario generation including requirements,
                    parameters, and template structure
+            return_dict: Parse and check the generated scenario instead of
+                   returning raw text. If the first response is unusable, the
+                   model is asked once more with the problem appended.
 
         Returns:
-            Generated scenario as YAML/JSON string
+            Generated scenario as YAML/JSON string, or with return_dict the
+            parsed scenario (None if no usable scenario was generated)
         """
+        if return_dict:
+            return self._generate_scenario_dict(prompt)
+
         try:
             # Build enhanced prompt for scenario generation
             scenario_prompt = self._build_scenario_generation_prompt(prompt)
@@ -437,217 +1109,239 @@ Theories submitted: {len(self.game_context.get('theories_submitted', []))}
                 return self._get_fallback_scenario()
 
         except Exception as e:
-            self.logger.error(f"Error in scenario generation: {e}")
-            return self._get_fallback_scenario()
-
-    def _build_action_prompt(self, action: str, details: str) -> str:
-        """Build prompt for investigation action"""
-        evidence_context = ""
-        if self.game_context.get("evidence_discovered"):
-            evidence_types = [
-                e.get("type", "Unknown")
-                for e in self.game_context["evidence_discovered"]
-            ]
-            evidence_context = (
-                f"\nEvidence already discovered: {', '.join(evidence_types)}"
-            )
-
-        return f"""Player is taking investigation action: {action}
-Details: {details}
-
-{evidence_context}
-
-Provide a realistic response about what the player discovers during this investigation action. Your response should:
-
-1. Describe what the investigation reveals - Be specific and realistic
-2. Format your response clearly - Use proper structure and formatting including line breaks for readability
-3. Only mention new evidence if it's directly relevant - Not every action should reveal evidence
-4. Be educational and informative - Help the player understand cybersecurity concepts
-5. Maintain realism - Don't reveal everything at once
+            self.logger.error("Error in scenario generation: %s", e)
+            return self._get_fallback_scenario()
 
-Important: The evidence discovery system handles finding new evidence separately.
-Focus on describing the investigation process and what would be observed, not on announcing evidence discoveries.
+    def _generate_scenario_dict(self, prompt: str) -> Optional[Dict[str, Any]]:
+        """Generate a scenario and parse it, retrying once on a bad response"""
+        scenario_prompt = self._build_scenario_generation_prompt(prompt)
 
-Format your response with clear sections if appropriate, using proper paragraph breaks and structure for readability in a web interface.
-"""
+        for attempt in range(2):
+            try:
+                response = self._get_ai_response(scenario_prompt)
+            except Exception as e:
+                self.logger.error("Error in scenario generation: %s", e)
+                return None
 
-    def _build_theory_prompt(self, theory: str) -> str:
-        """Build prompt for theory evaluation"""
-        scenario_summary = self._get_scenario_summary()
+            try:
+                scenario = _parse_generated_scenario(response or "")
+            except ValueError as e:
+                self.logger.warning("Generated scenario rejected: %s", e)
+                scenario_prompt = (
+                    f"{scenario_prompt}\n\nYour previous response could not be "
+                    f"used: {e}\nReturn the complete scenario again as valid YAML."
+                )
+                continue
 
-        return f"""Player has submitted this theory about the incident:
-"{theory}"
+            self.logger.info("Scenario generation successful")
+            return scenario
 
-Scenario context: {scenario_summary}
+        return None
 
-Evaluate this theory and provide:
-1. What aspects are correct or on the right track
-2. What might need refinement or additional investigation
-3. Constructive feedback to guide further investigation
-4. Whether this theory demonstrates good understanding of the incident
+    def generate_scenarios_batch(
+        self, prompts: List[str], poll_interval: float = 30.0
+    ) -> List[str]:
+        """
+        Generate several scenarios in one bulk request.
 
-Be supportive but accurate. Don't give away the complete answer.
-"""
+        With the Google provider and INCIDENTER_BATCH_GCS_URI set (a gs://
+        bucket/prefix for job files), prompts are submitted as a Vertex AI
+        batch prediction job, which is billed at the discounted batch rate.
+        Otherwise the prompts are generated concurrently.
 
-    def _build_hint_prompt(self, context: str) -> str:
-        """Build prompt for providing hints"""
-        return f"""Player is requesting a hint. Context: {context}
+        Args:
+            prompts: Scenario generation prompts, as passed to generate_scenario
+            poll_interval: Seconds between batch job status checks
 
-Current investigation status:
-- Actions taken: {len(self.game_context.get('investigation_actions', []))}
-- Evidence found: {len(self.game_context.get('evidence_discovered', []))}
-- Theories submitted: {len(self.game_context.get('theories_submitted', []))}
+        Returns:
+            Generated scenarios in the same order as prompts
+        """
+        if not prompts:
+            return []
 
-Provide a helpful hint that:
-1. Guides them toward productive investigation
-2. Doesn't give away the answer
-3. Suggests specific investigation techniques or areas to explore
-4. Maintains the challenge level
+        gcs_uri = os.getenv("INCIDENTER_BATCH_GCS_URI")
+        if self.provider == "google" and gcs_uri:
+            try:
+                return self._generate_scenarios_vertex_batch(
+                    prompts, gcs_uri, poll_interval
+                )
+            except Exception as e:
+                self.logger.error("Batch scenario generation failed: %s", e)
 
-Keep it concise and actionable.
-"""
+        with ThreadPoolExecutor(max_workers=min(4, len(prompts))) as executor:
+            return list(executor.map(self.generate_scenario, prompts))
 
-    def _build_scenario_generation_prompt(self, user_prompt: str) -> str:
-        """Build comprehensive prompt for scenario generation"""
+    def _generate_scenarios_vertex_batch(
+        self, prompts: List[str], gcs_uri: str, poll_interval: float
+    ) -> List[str]:
+        """Run scenario prompts through a Vertex AI batch prediction job"""
+        from google.cloud import storage
 
-        system_context = """You are an expert cybersecurity scenario designer with deep knowledge of:
-- Historical cyberattacks and threat actor TTPs
-- MITRE ATT&CK framework and kill chain methodology
-- Forensic evidence and digital artifact analysis
-- Incident response procedures and investigation techniques
-- Red teaming and penetration testing methodologies
+        types = _genai_types()
+        bucket_name, _, prefix = gcs_uri.removeprefix("gs://").partition("/")
+        job_prefix = f"{prefix.strip('/')}/scenarios-{uuid.uuid4().hex}".lstrip("/")
+        bucket = storage.Client().bucket(bucket_name)
 
-Your task is to generate realistic, educational cybersecurity incident scenarios that:
-1. Are technically accurate and forensically sound
-2. Follow established attack patterns and TTPs
-3. Include realistic evidence and artifacts
-4. Provide appropriate challenge level for the specified difficulty
-5. Include compelling red herrings to increase realism
-6. Map to MITRE ATT&CK techniques
+        # One request per line; labels carry the input position back out
+        system_prompt = self.get_system_prompt()
+        lines = []
+        for i, prompt in enumerate(prompts):
+            text = self._build_scenario_generation_prompt(prompt)
+            request = {
+                "systemInstruction": {"parts": [{"text": system_prompt}]},
+                "contents": [{"role": "user", "parts": [{"text": text}]}],
+                "generationConfig": {
+                    "temperature": 0.7,
+                    "topP": 0.95,
+                    "maxOutputTokens": 500,
+                },
+                "labels": {"custom_id": str(i)},
+            }
+            lines.append(json.dumps({"request": request}))
+        bucket.blob(f"{job_prefix}/input.jsonl").upload_from_string("\n".join(lines))
+
+        job = self._client.batches.create(
+            model=self.model,
+            src=f"gs://{bucket_name}/{job_prefix}/input.jsonl",
+            config=types.CreateBatchJobConfig(
+                dest=f"gs://{bucket_name}/{job_prefix}/output"
+            ),
+        )
+        self.logger.info("Submitted batch scenario job: %s", job.name)
+
+        done_states = {
+            types.JobState.JOB_STATE_SUCCEEDED,
+            types.JobState.JOB_STATE_PARTIALLY_SUCCEEDED,
+            types.JobState.JOB_STATE_FAILED,
+            types.JobState.JOB_STATE_CANCELLED,
+            types.JobState.JOB_STATE_EXPIRED,
+        }
+        while job.state not in done_states:
+            time.sleep(poll_interval)
+            job = self._client.batches.get(name=job.name)
 
-Generate scenarios in valid YAML format following the provided template structure exactly."""
+        if job.state not in (
+            types.JobState.JOB_STATE_SUCCEEDED,
+            types.JobState.JOB_STATE_PARTIALLY_SUCCEEDED,
+        ):
+            raise RuntimeError(f"Batch job {job.name} ended in state {job.state}")
+
+        results = {}
+        for blob in bucket.list_blobs(prefix=f"{job_prefix}/output"):
+            if not blob.name.endswith(".jsonl"):
+                continue
+            for line in blob.download_as_text().splitlines():
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                try:
+                    custom_id = record["request"]["labels"]["custom_id"]
+                    parts = record["response"]["candidates"][0]["content"]["parts"]
+                    results[custom_id] = "".join(p.get("text", "") for p in parts)
+                except (KeyError, IndexError, TypeError):
+                    continue
+
+        return [
+            results.get(str(i)) or self._get_fallback_scenario()
+            for i in range(len(prompts))
+        ]
 
-        enhanced_prompt = f"""{system_context}
+    def _build_action_prompt(self, action: str, details: str) -> str:
+        """Build prompt for investigation action"""
+        evidence_context = ""
+        if self._evidence_type_counts:
+            evidence_types = ", ".join(
+                f"{evidence_type}×{count}"
+                for evidence_type, count in self._evidence_type_counts.most_common(
+                    _MAX_PROMPT_EVIDENCE_TYPES
+                )
+            )
+            evidence_context = f"\nEvidence already discovered: {evidence_types}"
+
+        return "".join(
+            (
+                _ACTION_PROMPT_PARTS[0],
+                action,
+                _ACTION_PROMPT_PARTS[1],
+                details,
+                _ACTION_PROMPT_PARTS[2],
+                evidence_context,
+                _ACTION_PROMPT_PARTS[3],
+            )
+        )
 
-{user_prompt}
+    def _build_theory_prompt(self, theory: str) -> str:
+        """Build prompt for theory evaluation"""
+        return "".join(
+            (
+                _THEORY_PROMPT_PARTS[0],
+                theory,
+                _THEORY_PROMPT_PARTS[1],
+                self._get_scenario_summary(),
+                _THEORY_PROMPT_PARTS[2],
+            )
+        )
 
-IMPORTANT GUIDELINES:
-- Return only valid YAML content, no additional text or markdown
-- Ensure all MITRE technique IDs are valid (format: T####)
-- Include realistic technical details (IPs, domains, file hashes, etc.)
-- Make evidence discoverable through logical investigation steps
-- Balance difficulty appropriately for the specified complexity level
-- Include 25% red herrings that are plausible but misleading
-- All fictional organizations, domains, and data should be clearly fake
-"""
+    def _build_hint_prompt(self, context: str) -> str:
+        """Build prompt for providing hints"""
+        return "".join(
+            (
+                _HINT_PROMPT_PARTS[0],
+                context,
+                _HINT_PROMPT_PARTS[1],
+                str(self._action_seq),
+                _HINT_PROMPT_PARTS[2],
+                str(len(self.game_context.get("evidence_discovered", []))),
+                _HINT_PROMPT_PARTS[3],
+                str(len(self.game_context.get("theories_submitted", []))),
+                _HINT_PROMPT_PARTS[4],
+            )
+        )
 
-        return enhanced_prompt
+    def _build_scenario_generation_prompt(self, user_prompt: str) -> str:
+        """Build comprehensive prompt for scenario generation"""
+        return "".join(
+            (_SCENARIO_PROMPT_PARTS[0], user_prompt, _SCENARIO_PROMPT_PARTS[1])
+        )
 
     def _get_fallback_scenario(self) -> str:
         """Return a basic fallback scenario if AI generation fails"""
-        fallback = """scenario_metadata:
-  name: "Generic Phishing Incident"
-  id: "FALLBACK-001"
-  version: "1.0"
-  inspiration:
-    attack_name: "Generic Phishing"
-    year: 2024
-    attribution: "Unknown"
-    references: []
-  environment:
-    sector: "technology"
-    organization_size: "medium"
-    infrastructure: "hybrid"
-  difficulty: "intermediate"
-  estimated_duration: "2-3 hours"
-  description: "A phishing campaign targeting employee credentials leads to unauthorized access."
-
-attack_overview:
-  summary: "Attackers used spear-phishing emails to steal credentials and gain initial access to corporate systems."
-  attack_type: "credential_theft"
-  sophistication_level: "medium"
-  objectives:
-    primary: "Credential harvesting"
-    secondary: "Data exfiltration"
-
-initial_alert:
-  timestamp: "2024-06-25T14:30:00Z"
-  source: "Email Security Gateway"
-  alert_type: "Suspicious email detected"
-  description: "Multiple employees reported receiving suspicious emails requesting credential verification."
-  initial_indicators:
-    - "Phishing emails from external domain"
-    - "Suspicious login attempts"
-    - "Unusual network traffic"
-
-timeline:
-  start: "2024-06-25T08:00:00Z"
-  discovery: "2024-06-25T14:30:00Z"
-  phases:
-    - phase: "Initial Access"
-      mitre_id: "T1566"
-      start_time: "2024-06-25T08:00:00Z"
-      duration: "6 hours"
-      description: "Phishing campaign launched"
-
-evidence:
-  items:
-    - id: "FALLBACK-E001"
-      type: "email"
-      source: "mail_server"
-      importance: "critical"
-      description: "Phishing email with malicious link"
+        return _FALLBACK_SCENARIO_YAML
 
-kill_chain:
-  phases:
-    - name: "Initial Access"
-      mitre_id: "T1566"
-      techniques: ["T1566.002"]
-      description: "Spearphishing link"
+    def _get_ai_response(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        """
+        Get response from AI provider, retrying transient failures
 
-scoring:
-  total_points: 100
-  phases:
-    - name: "Initial Access"
-      points: 25
-      criteria: ["Identify phishing vector"]
-"""
-        return fallback
+        Background workers pass the system prompt they captured when the
+        work was submitted, so they never rebuild the shared prompt cache.
+        """
+        for attempt in range(_RETRY_ATTEMPTS):
+            try:
+                return self._request_ai_response(prompt, system_prompt)
+            except Exception as e:
+                if _is_auth_error(e):
+                    _forget_validations(self.provider)
+                if attempt + 1 == _RETRY_ATTEMPTS or not _is_transient_error(e):
+                    raise
+                delay = _retry_delay(attempt)
+                self.logger.warning(
+                    "Transient AI provider error, retrying in %.1fs: %s", delay, e
+                )
+                time.sleep(delay)
 
-    def _get_ai_response(self, prompt: str) -> str:
-        """Get response from AI provider"""
-        system_prompt = self.get_system_prompt()
-        full_prompt = f"{system_prompt}\n\n{prompt}"
+    def _request_ai_response(
+        self, prompt: str, system_prompt: Optional[str] = None
+    ) -> str:
+        """Make a single request to the AI provider"""
+        if system_prompt is None:
+            system_prompt = self.get_system_prompt()
 
         if self.provider == "google":
             # Use Vertex AI for content generation
-            contents = types.Part.from_text(text=full_prompt)
-
-            generate_content_config = types.GenerateContentConfig(
-                temperature=0.7,
-                top_p=0.95,
-                max_output_tokens=500,
-                response_modalities=["TEXT"],
-                safety_settings=[
-                    types.SafetySetting(
-                        category="HARM_CATEGORY_HATE_SPEECH", threshold="OFF"
-                    ),
-                    types.SafetySetting(
-                        category="HARM_CATEGORY_DANGEROUS_CONTENT", threshold="OFF"
-                    ),
-                    types.SafetySetting(
-                        category="HARM_CATEGORY_SEXUALLY_EXPLICIT", threshold="OFF"
-                    ),
-                    types.SafetySetting(
-                        category="HARM_CATEGORY_HARASSMENT", threshold="OFF"
-                    ),
-                ],
-            )
-
             response = self._client.models.generate_content(
                 model=self.model,
-                contents=contents,
-                config=generate_content_config,
+                contents=_genai_types().Part.from_text(text=prompt),
+                config=self._google_content_config(system_prompt),
             )
 
             return response.text
@@ -660,32 +1354,118 @@ scoring:
                     {"role": "user", "content": prompt},
                 ],
                 max_tokens=500,
-                temperature=0.7,
+                temperature=self.temperature,
             )
             return response.choices[0].message.content
 
         else:
             raise ValueError(f"Unsupported provider: {self.provider}")
 
+    def _get_ai_response_stream(self, prompt: str) -> Iterator[str]:
+        """Stream the response from the AI provider chunk by chunk"""
+        system_prompt = self.get_system_prompt()
+
+        if self.provider == "google":
+            for chunk in self._client.models.generate_content_stream(
+                model=self.model,
+                contents=_genai_types().Part.from_text(text=prompt),
+                config=self._google_content_config(system_prompt),
+            ):
+                if chunk.text:
+                    yield chunk.text
+
+        elif self.provider == "openai":
+            for chunk in self._client.ChatCompletion.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt},
+                ],
+                max_tokens=500,
+                temperature=self.temperature,
+                stream=True,
+            ):
+                content = chunk.choices[0].delta.get("content")
+                if content:
+                    yield content
+
+        else:
+            # Providers without streaming return the whole response at once
+            yield self._get_ai_response(prompt)
+
+    async def _get_ai_response_async(self, prompt: str) -> str:
+        """Get response from AI provider without blocking the event loop"""
+        for attempt in range(_RETRY_ATTEMPTS):
+            try:
+                return await self._request_ai_response_async(prompt)
+            except Exception as e:
+                if _is_auth_error(e):
+                    _forget_validations(self.provider)
+                if attempt + 1 == _RETRY_ATTEMPTS or not _is_transient_error(e):
+                    raise
+                delay = _retry_delay(attempt)
+                self.logger.warning(
+                    "Transient AI provider error, retrying in %.1fs: %s", delay, e
+                )
+                await asyncio.sleep(delay)
+
+    async def _request_ai_response_async(self, prompt: str) -> str:
+        """Make a single request to the AI provider from the event loop"""
+        if self.provider == "google":
+            response = await self._client.aio.models.generate_content(
+                model=self.model,
+                contents=_genai_types().Part.from_text(text=prompt),
+                config=self._google_content_config(self.get_system_prompt()),
+            )
+            return response.text
+
+        # Other providers only have a blocking client; run it off the loop
+        return await asyncio.to_thread(
+            self._request_ai_response, prompt, self.get_system_prompt()
+        )
+
+    def _google_content_config(self, system_prompt: Optional[str] = None):
+        """Generation settings for Vertex AI requests"""
+        types = _genai_types()
+        return types.GenerateContentConfig(
+            system_instruction=system_prompt,
+            temperature=self.temperature,
+            top_p=0.95,
+            max_output_tokens=500,
+            response_modalities=["TEXT"],
+            safety_settings=[
+                types.SafetySetting(
+                    category="HARM_CATEGORY_HATE_SPEECH", threshold="OFF"
+                ),
+                types.SafetySetting(
+                    category="HARM_CATEGORY_DANGEROUS_CONTENT", threshold="OFF"
+                ),
+                types.SafetySetting(
+                    category="HARM_CATEGORY_SEXUALLY_EXPLICIT", threshold="OFF"
+                ),
+                types.SafetySetting(
+                    category="HARM_CATEGORY_HARASSMENT", threshold="OFF"
+                ),
+            ],
+        )
+
     def _process_response(self, response: str, action: str) -> FacilitatorResponse:
         """Process AI response into structured format"""
         # Simple confidence scoring based on response characteristics
         confidence = 0.8 if len(response) > 50 else 0.6
 
-        # Extract suggestions (simple heuristic)
-        suggestions = []
-        if "investigate" in response.lower():
-            suggestions.append("Continue investigating based on this information")
-        if "evidence" in response.lower():
-            suggestions.append("Document any new evidence discovered")
-        if "timeline" in response.lower():
-            suggestions.append("Consider the timing of events")
+        # Extract suggestions (simple heuristic) in a single scan
+        mask = 0
+        for match in _RESPONSE_KEYWORDS.finditer(response):
+            mask |= _KEYWORD_BITS[match.group(0).lower()]
+            if mask == _ALL_KEYWORDS_MASK:
+                break
 
         return FacilitatorResponse(
             content=response,
             confidence=confidence,
-            suggestions=suggestions or ["Continue your investigation"],
-            requires_followup="question" in response.lower(),
+            suggestions=list(_SUGGESTIONS_BY_MASK[mask]),
+            requires_followup=bool(mask & _FOLLOWUP_BIT),
         )
 
     def _process_theory_response(
@@ -693,7 +1473,7 @@ scoring:
     ) -> FacilitatorResponse:
         """Process theory evaluation response"""
         # Score confidence based on response content
-        confidence = 0.9 if "correct" in response.lower() else 0.7
+        confidence = 0.9 if _CORRECT_KEYWORD.search(response) else 0.7
 
         suggestions = [
             "Continue building on this theory",
@@ -718,7 +1498,7 @@ scoring:
         """Get summary of current game state"""
         return {
             "scenario": self.scenario_data.get("name"),
-            "actions_taken": len(self.game_context.get("investigation_actions", [])),
+            "actions_taken": self._action_seq,
             "evidence_found": len(self.game_context.get("evidence_discovered", [])),
             "theories_submitted": len(self.game_context.get("theories_submitted", [])),
             "conversation_length": len(self.conversation_history),
@@ -728,6 +1508,9 @@ scoring:
         self, response: FacilitatorResponse, title: str = "Facilitator"
     ):
         """Display a facilitator response with rich formatting"""
+        from rich.panel import Panel
+        from rich.text import Text
+
         # Create the main content panel
         content_text = Text(response.content)
 
@@ -746,7 +1529,12 @@ scoring:
             padding=(1, 2),
         )
 
-        console.print(panel)
+        _get_console().print(panel)
+        self._display_response_details(response)
+
+    def _display_response_details(self, response: FacilitatorResponse):
+        """Display the suggestions and context that follow a response panel"""
+        console = _get_console()
 
         # Show suggestions if available
         if response.suggestions:
@@ -764,22 +1552,46 @@ scoring:
         """
         Validate OpenAI API credentials by making a test request
 
+        The outcome is cached per API key, so facilitators created shortly
+        after one another only make the test request once.
+
         Returns:
             bool: True if credentials are valid, False otherwise
         """
+        openai = _openai()
         if not openai:
             self.logger.error("OpenAI library not available")
             return False
 
-        try:
-            api_key = os.getenv("OPENAI_API_KEY")
-            if not api_key:
-                self.logger.error("OPENAI_API_KEY environment variable not set")
-                return False
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            self.logger.error("OPENAI_API_KEY environment variable not set")
+            return False
+
+        errors = _openai_errors()
+        if errors is None:
+            self.logger.error("OpenAI API structure error: openai.error not found")
+            self.logger.error("%s", _OPENAI_VERSION_HINT)
+            return False
+
+        # Set the API key for testing and for the client
+        openai.api_key = api_key
 
-            # Set the API key for testing
-            openai.api_key = api_key
+        cache_key = ("openai", hashlib.sha256(api_key.encode()).digest())
+        cached = _cached_validation(cache_key)
+        if cached is not None:
+            return cached
 
+        return _store_validation(
+            cache_key, self._request_openai_validation(openai, errors)
+        )
+
+    def _request_openai_validation(
+        self, openai, errors: Tuple[type, type, type]
+    ) -> bool:
+        """Make the OpenAI test request behind _validate_openai_credentials"""
+        rate_limit_error, authentication_error, openai_error = errors
+        try:
             # Test with a minimal API call to validate credentials
             self.logger.info("Testing OpenAI API credentials...")
 
@@ -799,100 +1611,96 @@ scoring:
                 self.logger.error("Invalid response from OpenAI API")
                 return False
 
-        except openai.error.AuthenticationError:
-            self.logger.error("OpenAI API key is invalid or expired")
-            return False
-        except openai.error.RateLimitError:
+        except rate_limit_error:
             self.logger.warning("OpenAI API rate limit exceeded during validation")
             # Rate limit doesn't mean invalid credentials
             return True
-        except openai.error.APIError as e:
-            self.logger.error(f"OpenAI API error during validation: {e}")
-            return False
-        except openai.error.OpenAIError as e:
-            self.logger.error(f"OpenAI error during validation: {e}")
+        except authentication_error:
+            self.logger.error("OpenAI API key is invalid or expired")
             return False
-        except AttributeError as e:
-            # Handle case where openai module structure is different
-            self.logger.error(f"OpenAI API structure error: {e}")
-            self.logger.error(
-                "Make sure you have the correct version of the openai library"
-            )
+        except openai_error as e:
+            self.logger.error("OpenAI API error during validation: %s", e)
             return False
         except Exception as e:
-            self.logger.error(f"Unexpected error validating OpenAI credentials: {e}")
-            return False
-
-    def test_connection(self) -> bool:
-        """Test if the AI facilitator can make successful API calls"""
-        try:
-            test_response = self.facilitate_action("test connection", "")
-            # If we get back the generic error message, the connection failed
-            return (
-                "I encountered an issue processing your action"
-                not in test_response.content
-            )
-        except Exception:
+            self.logger.error("Unexpected error validating OpenAI credentials: %s", e)
             return False
 
-
-class MockFacilitator(AIFacilitator):
-    """Mock facilitator for testing and offline use"""
-
-    def __init__(self):
-        """Initialize mock facilitator without AI providers"""
-        self.provider = "mock"
-        self.model = "mock-model"
-        self.logger = logging.getLogger(__name__)
-        self._client = None
-
-        # Game context and memory - properly initialize like the real facilitator
-        self.game_context = {
-            "scenario_id": None,
-            "scenario_name": None,
-            "difficulty": "medium",
-            "attack_type": None,
-            "timeline": {},
-            "evidence_discovered": [],
-            "theories_submitted": [],
-            "investigation_actions": [],
-        }
-        self.conversation_history = []
-        self.scenario_data = {}
-
-    def _get_ai_response(self, prompt: str) -> str:
-        """Return mock responses for testing"""
-        if "theory" in prompt.lower():
-            return (
-                "Your theory shows good understanding of the attack pattern. "
-                "Consider investigating the network logs more thoroughly to find "
-                "additional evidence of lateral movement."
-            )
-        elif "hint" in prompt.lower():
-            return (
-                "Focus on the timeline of events. Look for any unusual network "
-                "activity or authentication patterns that occurred around the "
-                "same time as the initial alert."
-            )
+    def _credential_digest(self) -> bytes:
+        """Hash of the credential this facilitator's requests run under"""
+        if self.provider == "openai":
+            credential = os.getenv("OPENAI_API_KEY", "")
         else:
-            return (
-                "Investigation reveals important information. You should document "
-                "this finding and consider how it relates to the overall attack "
-                "timeline. This appears to be a significant piece of evidence."
+            credential = os.getenv("GOOGLE_AI_API_KEY") or "adc:{}:{}".format(
+                os.getenv("GOOGLE_APPLICATION_CREDENTIALS", ""), self._project
             )
+        return hashlib.sha256(credential.encode()).digest()
 
+    def test_connection(self) -> bool:
+        """Test if the AI facilitator can make successful API calls"""
+        cache_key = (
+            self.provider,
+            "connection",
+            self.model,
+            self._credential_digest(),
+        )
+        cached = _cached_validation(cache_key)
+        if cached is not None:
+            return cached
 
-def get_facilitator(provider: str = None, model: str = None) -> AIFacilitator:
+        try:
+            self._facilitate_action("test connection", "")
+            ok = True
+        except FacilitatorProcessingError:
+            ok = False
+        return _store_validation(cache_key, ok)
+
+
+# Console guidance printed by get_facilitator, one write per message
+_NO_PROVIDER_HELP = (
+    "[yellow]⚠️  No AI provider available, using mock facilitator[/yellow]\n"
+    "[blue]💡 To enable AI facilitation:[/blue]\n"
+    "   • Set GOOGLE_AI_API_KEY environment variable, or\n"
+    "   • Run 'gcloud auth login --update-adc' for ADC"
+)
+_AUTH_HELP = {
+    "google": (
+        "[blue]🔐 Google AI Authentication options:[/blue]\n"
+        "   1. [yellow]API Key (Recommended):[/yellow] Set GOOGLE_AI_API_KEY environment variable\n"
+        "      Get your key at: https://makersuite.google.com/app/apikey\n"
+        "   2. [yellow]ADC (Advanced):[/yellow] Run 'gcloud auth login --update-adc'\n"
+        "      Note: ADC requires proper scopes and works best with service accounts"
+    ),
+    "openai": (
+        "[blue]🔐 OpenAI Authentication options:[/blue]\n"
+        "   • [yellow]API Key:[/yellow] Set OPENAI_API_KEY environment variable\n"
+        "     Get your key at: https://platform.openai.com/api-keys"
+    ),
+}
+_INVALID_KEY_TIPS = {
+    "google": "[yellow]💡 Tip: Verify your GOOGLE_AI_API_KEY is valid and has proper permissions[/yellow]",
+    "openai": "[yellow]💡 Tip: Verify your OPENAI_API_KEY is valid and has sufficient quota[/yellow]",
+}
+
+
+def get_facilitator(
+    provider: str = None, model: str = None, deterministic: bool = False
+) -> AIFacilitator:
     """
     Factory function to get appropriate facilitator instance
 
     Args:
         provider: AI provider preference
         model: Model preference
+        deterministic: Sample at temperature 0, so repeated actions with an
+            unchanged prompt are answered from the facilitator's cache
 
     Returns:
         AIFacilitator instance
     """
+    from facilitator.mock_facilitator import MockFacilitator
+
+    console = _get_console()
+
     # Check for available providers
     if provider is None:
         # Check for Vertex AI first (API key or ADC)
@@ -900,101 +1708,88 @@ def get_facilitator(provider: str = None, model: str = None) -> AIFacilitator:
             os.getenv("GOOGLE_AI_API_KEY") or _has_adc_credentials()
         ):
             provider = "google"
-        elif openai and os.getenv("OPENAI_API_KEY"):
+        elif OPENAI_AVAILABLE and os.getenv("OPENAI_API_KEY"):
             provider = "openai"
         else:
-            console.print(
-                "[yellow]⚠️  No AI provider available, using mock facilitator[/yellow]"
-            )
-            console.print("[blue]💡 To enable AI facilitation:[/blue]")
-            console.print("   • Set GOOGLE_AI_API_KEY environment variable, or")
-            console.print("   • Run 'gcloud auth login --update-adc' for ADC")
+            console.print(_NO_PROVIDER_HELP)
             return MockFacilitator()
 
     try:
-        facilitator = AIFacilitator(provider=provider, model=model)
+        facilitator = AIFacilitator(
+            provider=provider,
+            model=model,
+            temperature=0.0 if deterministic else _DEFAULT_TEMPERATURE,
+        )
         console.print(
             f"[green]✅ {provider.title()} AI facilitator initialized successfully[/green]"
         )
         return facilitator
     except ValueError as e:
         error_msg = str(e)
+        error_lower = error_msg.lower()
 
-        # Handle specific error types with helpful messages
-        if "authenticate" in error_msg.lower() or "credentials" in error_msg.lower():
-            console.print(f"[red]❌ {provider.title()} authentication failed[/red]")
-
-            if provider == "google":
-                console.print("[blue]🔐 Google AI Authentication options:[/blue]")
-                console.print(
-                    "   1. [yellow]API Key (Recommended):[/yellow] Set GOOGLE_AI_API_KEY environment variable"
-                )
-                console.print(
-                    "      Get your key at: https://makersuite.google.com/app/apikey"
-                )
-                console.print(
-                    "   2. [yellow]ADC (Advanced):[/yellow] Run 'gcloud auth login --update-adc'"
-                )
-                console.print(
-                    "      Note: ADC requires proper scopes and works best with service accounts"
-                )
-            elif provider == "openai":
-                console.print("[blue]🔐 OpenAI Authentication options:[/blue]")
-                console.print(
-                    "   • [yellow]API Key:[/yellow] Set OPENAI_API_KEY environment variable"
-                )
-                console.print(
-                    "     Get your key at: https://platform.openai.com/api-keys"
-                )
+        # Handle specific error types with helpful messages, collected so
+        # the whole report goes out in one write
+        if "authenticate" in error_lower or "credentials" in error_lower:
+            lines = [f"[red]❌ {provider.title()} authentication failed[/red]"]
+            if provider in _AUTH_HELP:
+                lines.append(_AUTH_HELP[provider])
 
         elif "API key" in error_msg or "invalid" in error_msg:
-            console.print(f"[red]❌ {provider.title()} API credentials invalid:[/red]")
-            console.print(f"[dim]{error_msg}[/dim]")
-
-            if provider == "google":
-                console.print(
-                    "[yellow]💡 Tip: Verify your GOOGLE_AI_API_KEY is valid and has proper permissions[/yellow]"
-                )
-            elif provider == "openai":
-                console.print(
-                    "[yellow]💡 Tip: Verify your OPENAI_API_KEY is valid and has sufficient quota[/yellow]"
-                )
+            lines = [
+                f"[red]❌ {provider.title()} API credentials invalid:[/red]",
+                f"[dim]{error_msg}[/dim]",
+            ]
+            if provider in _INVALID_KEY_TIPS:
+                lines.append(_INVALID_KEY_TIPS[provider])
 
         elif "not available" in error_msg or "not supported" in error_msg:
-            console.print(
-                f"[red]❌ {provider.title()} provider not available:[/red] {error_msg}"
-            )
-            console.print(
-                "[yellow]💡 Install required dependencies or check provider name[/yellow]"
-            )
+            lines = [
+                f"[red]❌ {provider.title()} provider not available:[/red] {error_msg}",
+                "[yellow]💡 Install required dependencies or check provider name[/yellow]",
+            ]
 
         else:
-            console.print(
+            lines = [
                 f"[red]❌ {provider.title()} initialization failed:[/red] {error_msg}"
-            )
+            ]
 
-        console.print(
+        lines.append(
             "[yellow]🔄 Falling back to mock facilitator with intelligent responses[/yellow]"
         )
+        console.print("\n".join(lines))
         return MockFacilitator()
     except Exception as e:
         console.print(
-            f"[red]❌ Unexpected error initializing {provider} facilitator:[/red] {e}"
+            f"[red]❌ Unexpected error initializing {provider} facilitator:[/red] {e}\n"
+            "[yellow]🔄 Falling back to mock facilitator[/yellow]"
         )
-        console.print("[yellow]🔄 Falling back to mock facilitator[/yellow]")
         return MockFacilitator()
 
 
+# Result of the Application Default Credentials probe, once it has run
+_ADC_CACHED: Optional[bool] = None
+
+
 def _has_adc_credentials() -> bool:
     """Check if Application Default Credentials are available"""
+    global _ADC_CACHED
+    if _ADC_CACHED is not None:
+        return _ADC_CACHED
+
     try:
         from google.auth import default as google_default_credentials
-        from google.auth.exceptions import DefaultCredentialsError
 
         # Try to get default credentials
-        credentials, project = google_default_credentials()
-        return True
-    except (DefaultCredentialsError, ImportError):
-        return False
+        google_default_credentials()
+        _ADC_CACHED = True
     except Exception:
-        return False
+        # DefaultCredentialsError, a missing google-auth, or a failed probe
+        _ADC_CACHED = False
+    return _ADC_CACHED
+
+
+def _reset_adc_cache():
+    """Forget the ADC probe result so the next check runs it again"""
+    global _ADC_CACHED
+    _ADC_CACHED = None
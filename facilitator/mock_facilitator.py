@@ -1,98 +1,192 @@
 """
 Mock AI Facilitator for Incidenter
-Provides simple mock responses for testing purposes
+Provides simple mock responses for testing and offline use
 """
 
+import logging
 import random
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
-
-
-@dataclass
-class FacilitatorResponse:
-    """Response from the AI facilitator"""
-
-    content: str
-    confidence: float
-    suggestions: List[str]
-    additional_context: Optional[str] = None
-    requires_followup: bool = False
-
-
-class MockAIFacilitator:
-    """Mock AI facilitator for testing"""
+import re
+from typing import Callable, Dict, List, Optional, Any
+
+from facilitator.ai_facilitator import AIFacilitator, FacilitatorResponse
+
+# Private generator so mock responses don't contend for the global one
+_RNG = random.Random()
+
+# Canned investigation findings, keyed by the action keyword that selects them
+_INVESTIGATION_RESPONSES = {
+    "email": (
+        "Found suspicious phishing email from external sender with malicious attachment.",
+        "Discovered spear-phishing campaign targeting IT administrators with credential harvesting links.",
+        "Located ransomware delivery email with ZIP attachment containing malicious payload.",
+    ),
+    "log": (
+        "Network logs show unusual outbound connections to suspicious IP addresses.",
+        "Security logs reveal multiple failed authentication attempts followed by successful login.",
+        "System logs indicate process execution anomalies and suspicious file creation.",
+    ),
+    "process": (
+        "Identified suspicious process 'svchost.exe' running from unusual location.",
+        "Found evidence of lateral movement through remote process execution.",
+        "Discovered cryptocurrency mining process consuming excessive system resources.",
+    ),
+    "network": (
+        "Network traffic analysis reveals data exfiltration to command and control servers.",
+        "Firewall logs show blocked connections to known malicious domains.",
+        "DNS queries indicate communication with suspicious domains associated with ransomware.",
+    ),
+    "file": (
+        "File system analysis reveals encrypted files with ransom note extensions.",
+        "Found suspicious executable files dropped in temporary directories.",
+        "Discovered shadow copy deletion indicating ransomware preparation activities.",
+    ),
+    "ransom": (
+        "Located ransom note file 'HOW_TO_RECOVER_FILES.txt' in multiple directories.",
+        "Found ransom payment instructions demanding cryptocurrency payment.",
+        "Discovered ransom note indicating DarkSide ransomware group involvement.",
+    ),
+}
+
+# Keywords mentioned anywhere in the action, found with a lookahead so
+# overlapping mentions are all seen; the category listed first above wins,
+# wherever it appears in the action
+_CATEGORY_RE = re.compile(
+    "(?=({}))".format("|".join(_INVESTIGATION_RESPONSES)), re.IGNORECASE
+)
+_CATEGORY_PRIORITY = {
+    category: i for i, category in enumerate(_INVESTIGATION_RESPONSES)
+}
+
+_SUGGESTIONS = (
+    "Investigate related system components",
+    "Check for additional indicators of compromise",
+    "Document findings for timeline reconstruction",
+    "Look for evidence of persistence mechanisms",
+)
+
+# Hints for get_hint
+_HINTS = (
+    "Focus on the initial access vector - how did the attackers first get in?",
+    "Look for signs of reconnaissance and lateral movement through the network.",
+    "Check for evidence of data collection before the ransomware deployment.",
+    "Consider the timeline - what happened between initial access and encryption?",
+    "Examine network traffic for command and control communication patterns.",
+)
+
+_FEEDBACK = (
+    "Your theory shows good understanding of the attack vector. Consider the timeline of events.",
+    "You're on the right track. Think about what the attacker's ultimate goal might be.",
+    "That's an interesting perspective. What evidence supports this theory?",
+    "Good analysis. Consider how this relates to the broader attack chain.",
+    "Your theory addresses part of the incident. What other factors might be involved?",
+)
+_FEEDBACK_SUGGESTIONS = (
+    "Review the evidence timeline more carefully",
+    "Consider the attacker's motivations",
+    "Look for additional indicators of compromise",
+)
+
+_EVAL_RESPONSES = (
+    "That's a good investigative step. This should provide valuable information.",
+    "Excellent choice. This action will help clarify the situation.",
+    "This investigation approach makes sense given the current evidence.",
+    "Good thinking. This should reveal important details about the incident.",
+)
+_EVAL_SUGGESTIONS = (
+    "Continue investigating related systems",
+    "Document your findings",
+)
+
+# Evidence templates; only the chosen one has {action} filled in
+_EVIDENCE_TEMPLATES = (
+    {
+        "type": "log_entry",
+        "description": "Found relevant log entries related to {action}",
+        "details": "Multiple authentication failures detected",
+        "timestamp": "2024-01-15 14:23:17",
+        "source": "Security logs",
+    },
+    {
+        "type": "network_traffic",
+        "description": "Network traffic analysis from {action}",
+        "details": "Unusual outbound connections to external IPs",
+        "timestamp": "2024-01-15 14:25:33",
+        "source": "Network monitoring",
+    },
+    {
+        "type": "file_analysis",
+        "description": "File system changes discovered during {action}",
+        "details": "Suspicious executables found in temp directory",
+        "timestamp": "2024-01-15 14:18:42",
+        "source": "File system audit",
+    },
+)
+
+# Canned replies for prompts the AIFacilitator methods send to
+# _get_ai_response, keyed by the word that marks the prompt kind
+_PROMPT_KIND = re.compile("theory|hint", re.IGNORECASE)
+_PROMPT_RESPONSES = {
+    "theory": (
+        "Your theory shows good understanding of the attack pattern. "
+        "Consider investigating the network logs more thoroughly to find "
+        "additional evidence of lateral movement."
+    ),
+    "hint": (
+        "Focus on the timeline of events. Look for any unusual network "
+        "activity or authentication patterns that occurred around the "
+        "same time as the initial alert."
+    ),
+    "default": (
+        "Investigation reveals important information. You should document "
+        "this finding and consider how it relates to the overall attack "
+        "timeline. This appears to be a significant piece of evidence."
+    ),
+}
+
+
+class MockAIFacilitator(AIFacilitator):
+    """Mock facilitator for testing and offline use, without AI providers"""
 
     def __init__(self):
-        self.scenario_data = {}
-        self.game_context = {}
-        self.conversation_history = []
-
-    def load_scenario(self, scenario_data: Dict[str, Any]):
-        """Load scenario data for context"""
-        self.scenario_data = scenario_data
-
-    def provide_hint(self, scenario: Dict[str, Any], game_session) -> Dict[str, Any]:
-        """Provide a helpful hint"""
-        hints = [
-            "Look for unusual network traffic patterns in the logs.",
-            "Check for any recent software updates or patches that may have failed.",
-            "Examine user authentication logs for suspicious activity.",
-            "Review system event logs around the time of the incident.",
-            "Consider checking for any new processes or services running.",
-            "Look for file system changes or modifications to critical files.",
-            "Check if any security tools detected threats before the incident.",
-            "Review backup logs to see if data integrity was compromised.",
-        ]
-
-        return {
-            "success": True,
-            "message": random.choice(hints),
-            "confidence": random.uniform(0.7, 0.9),
-        }
+        """Initialize mock facilitator without AI providers"""
+        self.provider = "mock"
+        self.model = "mock-model"
+        self.validate_live = False
+        self.prefetch_hints = False
+        self.temperature = 0.7
+        self._pending_hint = None
+        self._hint_executor = None
+        self.logger = logging.getLogger(__name__)
+        self._client = None
+        self._project = ""
+        self._init_game_state()
+
+    def _get_ai_response(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        """Return mock responses for testing"""
+        match = _PROMPT_KIND.search(prompt)
+        return _PROMPT_RESPONSES[match.group(0).lower() if match else "default"]
 
     def provide_feedback(
         self, theory: str, scenario: Dict[str, Any], evidence: List[Dict]
     ) -> Dict[str, Any]:
         """Provide feedback on a theory"""
-        feedback_options = [
-            "Your theory shows good understanding of the attack vector. Consider the timeline of events.",
-            "You're on the right track. Think about what the attacker's ultimate goal might be.",
-            "That's an interesting perspective. What evidence supports this theory?",
-            "Good analysis. Consider how this relates to the broader attack chain.",
-            "Your theory addresses part of the incident. What other factors might be involved?",
-        ]
-
-        accuracy_score = random.uniform(0.6, 0.95)
+        accuracy_score = 0.6 + _RNG.random() * 0.35
 
         return {
             "success": True,
-            "feedback": random.choice(feedback_options),
+            "feedback": _RNG.choice(_FEEDBACK),
             "accuracy_score": accuracy_score,
-            "suggestions": [
-                "Review the evidence timeline more carefully",
-                "Consider the attacker's motivations",
-                "Look for additional indicators of compromise",
-            ],
+            "suggestions": list(_FEEDBACK_SUGGESTIONS),
         }
 
     def evaluate_investigation_action(
         self, action: str, context: Dict[str, Any]
     ) -> FacilitatorResponse:
         """Evaluate an investigation action"""
-        responses = [
-            "That's a good investigative step. This should provide valuable information.",
-            "Excellent choice. This action will help clarify the situation.",
-            "This investigation approach makes sense given the current evidence.",
-            "Good thinking. This should reveal important details about the incident.",
-        ]
-
         return FacilitatorResponse(
-            content=random.choice(responses),
-            confidence=random.uniform(0.7, 0.9),
-            suggestions=[
-                "Continue investigating related systems",
-                "Document your findings",
-            ],
+            content=_RNG.choice(_EVAL_RESPONSES),
+            confidence=0.7 + _RNG.random() * 0.2,
+            suggestions=list(_EVAL_SUGGESTIONS),
             requires_followup=False,
         )
 
@@ -100,107 +194,47 @@ class MockAIFacilitator:
         self, action: str, scenario: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Generate evidence based on investigation action"""
-        evidence_templates = [
-            {
-                "type": "log_entry",
-                "description": f"Found relevant log entries related to {action}",
-                "details": "Multiple authentication failures detected",
-                "timestamp": "2024-01-15 14:23:17",
-                "source": "Security logs",
-            },
-            {
-                "type": "network_traffic",
-                "description": f"Network traffic analysis from {action}",
-                "details": "Unusual outbound connections to external IPs",
-                "timestamp": "2024-01-15 14:25:33",
-                "source": "Network monitoring",
-            },
-            {
-                "type": "file_analysis",
-                "description": f"File system changes discovered during {action}",
-                "details": "Suspicious executables found in temp directory",
-                "timestamp": "2024-01-15 14:18:42",
-                "source": "File system audit",
-            },
-        ]
-
-        return random.choice(evidence_templates)
-
-    def facilitate_action(self, action: str, details: str = "") -> FacilitatorResponse:
-        """Facilitate an investigation action (compatible with AIFacilitator interface)"""
-
-        # Generate realistic investigation responses based on the action
-        investigation_responses = {
-            "email": [
-                "Found suspicious phishing email from external sender with malicious attachment.",
-                "Discovered spear-phishing campaign targeting IT administrators with credential harvesting links.",
-                "Located ransomware delivery email with ZIP attachment containing malicious payload.",
-            ],
-            "log": [
-                "Network logs show unusual outbound connections to suspicious IP addresses.",
-                "Security logs reveal multiple failed authentication attempts followed by successful login.",
-                "System logs indicate process execution anomalies and suspicious file creation.",
-            ],
-            "process": [
-                "Identified suspicious process 'svchost.exe' running from unusual location.",
-                "Found evidence of lateral movement through remote process execution.",
-                "Discovered cryptocurrency mining process consuming excessive system resources.",
-            ],
-            "network": [
-                "Network traffic analysis reveals data exfiltration to command and control servers.",
-                "Firewall logs show blocked connections to known malicious domains.",
-                "DNS queries indicate communication with suspicious domains associated with ransomware.",
-            ],
-            "file": [
-                "File system analysis reveals encrypted files with ransom note extensions.",
-                "Found suspicious executable files dropped in temporary directories.",
-                "Discovered shadow copy deletion indicating ransomware preparation activities.",
-            ],
-            "ransom": [
-                "Located ransom note file 'HOW_TO_RECOVER_FILES.txt' in multiple directories.",
-                "Found ransom payment instructions demanding cryptocurrency payment.",
-                "Discovered ransom note indicating DarkSide ransomware group involvement.",
-            ],
+        template = _RNG.choice(_EVIDENCE_TEMPLATES)
+        return {
+            **template,
+            "description": template["description"].format(action=action),
         }
 
-        # Determine response category based on action keywords
-        action_lower = action.lower()
-        response_category = "log"  # default
+    def _facilitate_action(
+        self,
+        action: str,
+        details: str = "",
+        on_token: Optional[Callable[[str], None]] = None,
+    ) -> FacilitatorResponse:
+        """Facilitate an investigation action with a canned finding"""
+        self._prepare_action(action, details)
 
-        for category in investigation_responses.keys():
-            if category in action_lower:
-                response_category = category
-                break
+        # Determine response category based on action keywords
+        mentioned = {keyword.lower() for keyword in _CATEGORY_RE.findall(action)}
+        category = min(mentioned, key=_CATEGORY_PRIORITY.get, default="log")
+        content = _RNG.choice(_INVESTIGATION_RESPONSES[category])
 
-        # Select appropriate response
-        responses = investigation_responses.get(
-            response_category, investigation_responses["log"]
-        )
-        content = random.choice(responses)
+        if on_token is not None:
+            on_token(content)
 
-        # Generate relevant suggestions
-        suggestions = [
-            "Investigate related system components",
-            "Check for additional indicators of compromise",
-            "Document findings for timeline reconstruction",
-            "Look for evidence of persistence mechanisms",
-        ]
+        # Two distinct suggestions: pick the second from the remaining slots
+        first = _RNG.randrange(len(_SUGGESTIONS))
+        second = _RNG.randrange(len(_SUGGESTIONS) - 1)
+        if second >= first:
+            second += 1
 
         return FacilitatorResponse(
             content=content,
-            confidence=random.uniform(0.75, 0.95),
-            suggestions=random.sample(suggestions, 2),
+            confidence=0.75 + _RNG.random() * 0.2,
+            suggestions=[_SUGGESTIONS[first], _SUGGESTIONS[second]],
             additional_context=f"Investigation: {action[:50]}{'...' if len(action) > 50 else ''}",
-            requires_followup=random.choice([True, False]),
+            requires_followup=_RNG.choice((True, False)),
         )
 
     def get_hint(self, **kwargs) -> str:
         """Provide a hint (compatible with AIFacilitator interface)"""
-        hints = [
-            "Focus on the initial access vector - how did the attackers first get in?",
-            "Look for signs of reconnaissance and lateral movement through the network.",
-            "Check for evidence of data collection before the ransomware deployment.",
-            "Consider the timeline - what happened between initial access and encryption?",
-            "Examine network traffic for command and control communication patterns.",
-        ]
-        return random.choice(hints)
+        return _RNG.choice(_HINTS)
+
+
+# get_facilitator's fallback; one mock class serves both names
+MockFacilitator = MockAIFacilitator
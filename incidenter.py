@@ -5,23 +5,50 @@ Incidenter CLI - Tabletop Cybersecurity Incident Response Game
 Main entry point for the incidenter game system.
 """
 
+import copy
+import json
 import os
 import sys
 import click
-import yaml
+from functools import lru_cache
 from pathlib import Path
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
-from cli.generator import ScenarioGenerator
-from cli.game_session import GameSession
-from cli.scenario_manager import ScenarioManager
+from rich.text import Text
+from cli import _yaml
+from cli._yaml_clean import clean_scenario_for_yaml
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Add current directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 console = Console()
 
+_SECTORS = (
+    "finance",
+    "healthcare",
+    "government",
+    "technology",
+    "retail",
+    "energy",
+    "manufacturing",
+    "education",
+    "transportation",
+    "utilities",
+    "telecommunications",
+    "media",
+    "defense",
+)
+_ORG_SIZES = ("small", "medium", "large", "enterprise")
+_INFRA_TYPES = ("on-premises", "cloud", "hybrid")
+_COMPLEXITIES = ("beginner", "intermediate", "advanced", "expert")
+_DIFFICULTY_ADJUSTMENTS = ("easier", "normal", "harder")
+
 
 @click.group()
 @click.version_option(version="1.0.0")
@@ -39,38 +66,22 @@ def cli():
 @cli.command()
 @click.option(
     "--sector",
-    type=click.Choice(
-        [
-            "finance",
-            "healthcare",
-            "government",
-            "technology",
-            "retail",
-            "energy",
-            "manufacturing",
-            "education",
-            "transportation",
-            "utilities",
-            "telecommunications",
-            "media",
-            "defense",
-        ]
-    ),
+    type=click.Choice(_SECTORS),
     help="Target organization sector",
 )
 @click.option(
     "--org-size",
-    type=click.Choice(["small", "medium", "large", "enterprise"]),
+    type=click.Choice(_ORG_SIZES),
     help="Organization size",
 )
 @click.option(
     "--infra",
-    type=click.Choice(["on-premises", "cloud", "hybrid"]),
+    type=click.Choice(_INFRA_TYPES),
     help="Infrastructure type",
 )
 @click.option(
     "--complexity",
-    type=click.Choice(["beginner", "intermediate", "advanced", "expert"]),
+    type=click.Choice(_COMPLEXITIES),
     default="intermediate",
     help="Scenario difficulty level",
 )
@@ -88,6 +99,8 @@ def generate(sector, org_size, infra, complexity, base_attack, output, interacti
     console.print("\n🎲 [bold blue]Generating New Incident Scenario[/bold blue]")
 
     try:
+        from cli.generator import ScenarioGenerator
+
         generator = ScenarioGenerator()
 
         if interactive:
@@ -112,8 +125,8 @@ def generate(sector, org_size, infra, complexity, base_attack, output, interacti
 
         # Save generated scenario
         clean_scenario = clean_scenario_for_yaml(scenario)
-        with open(output_path, "w") as f:
-            yaml.dump(clean_scenario, f, default_flow_style=False, indent=2)
+        with open(output_path, "wb") as f:
+            _yaml.dump(clean_scenario, f)
 
         console.print("\n✅ [green]Scenario generated successfully![/green]")
         console.print(f"📁 Saved to: {output_path}")
@@ -155,14 +168,37 @@ def generate(sector, org_size, infra, complexity, base_attack, output, interacti
 )
 @click.option(
     "--difficulty-adjustment",
-    type=click.Choice(["easier", "normal", "harder"]),
+    type=click.Choice(_DIFFICULTY_ADJUSTMENTS),
     default="normal",
     help="Adjust scenario difficulty on the fly",
 )
-def play(scenario_file, facilitator_model, team_size, difficulty_adjustment):
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Always ask the facilitator instead of reusing cached responses",
+)
+@click.option(
+    "--deterministic",
+    is_flag=True,
+    help="Use temperature 0 so repeated questions get the same answer",
+)
+@click.option(
+    "--semantic-cache",
+    is_flag=True,
+    help="Also reuse cached answers to similarly worded questions",
+)
+def play(
+    scenario_file,
+    facilitator_model,
+    team_size,
+    difficulty_adjustment,
+    no_cache,
+    deterministic,
+    semantic_cache,
+):
     """Start an interactive incident response game session."""
 
-    if not Path(scenario_file).exists():
+    if not os.path.exists(scenario_file):
         console.print(f"❌ [red]Scenario file not found: {scenario_file}[/red]")
         sys.exit(1)
 
@@ -173,15 +209,19 @@ def play(scenario_file, facilitator_model, team_size, difficulty_adjustment):
 
     try:
         # Load scenario
-        with open(scenario_file, "r") as f:
-            scenario = yaml.safe_load(f)
+        scenario = _yaml.load_path(scenario_file)
 
         # Initialize game session
+        from cli.game_session import GameSession
+
         game = GameSession(
             scenario=scenario,
             facilitator_model=facilitator_model,
             team_size=team_size,
             difficulty_adjustment=difficulty_adjustment,
+            use_cache=not no_cache,
+            deterministic=deterministic,
+            semantic_cache=semantic_cache,
         )
 
         # Start the game
@@ -197,14 +237,38 @@ def play(scenario_file, facilitator_model, team_size, difficulty_adjustment):
     "--library", "-l", is_flag=True, help="Show only pre-built library scenarios"
 )
 @click.option("--generated", "-g", is_flag=True, help="Show only generated scenarios")
-def list_scenarios(library, generated):
+@click.option(
+    "--plain", is_flag=True, help="Print tab-separated rows without formatting"
+)
+def list_scenarios(library, generated, plain):
     """List available scenarios."""
 
-    console.print("\n📚 [bold blue]Available Scenarios[/bold blue]\n")
+    from cli.scenario_manager import ScenarioManager
 
     manager = ScenarioManager()
     scenarios = manager.list_scenarios(library_only=library, generated_only=generated)
 
+    rows = []
+    for scenario in scenarios:
+        meta = scenario["metadata"]
+        rows.append(
+            (
+                meta["id"],
+                meta["name"],
+                meta["environment"]["sector"],
+                meta["difficulty"],
+                meta.get("inspiration", {}).get("attack_name", "Custom"),
+                "Library" if scenario["is_library"] else "Generated",
+            )
+        )
+
+    if plain:
+        # Machine-readable output bypasses Rich entirely
+        sys.stdout.write("".join("\t".join(map(str, row)) + "\n" for row in rows))
+        return
+
+    console.print("\n📚 [bold blue]Available Scenarios[/bold blue]\n")
+
     if not scenarios:
         console.print("[yellow]No scenarios found.[/yellow]")
         return
@@ -218,18 +282,9 @@ def list_scenarios(library, generated):
     table.add_column("Inspiration", style="blue")
     table.add_column("Type", style="red")
 
-    for scenario in scenarios:
-        meta = scenario["metadata"]
-        scenario_type = "Library" if scenario["is_library"] else "Generated"
-
-        table.add_row(
-            meta["id"],
-            meta["name"],
-            meta["environment"]["sector"],
-            meta["difficulty"],
-            meta.get("inspiration", {}).get("attack_name", "Custom"),
-            scenario_type,
-        )
+    for row in rows:
+        # Plain Text cells skip markup parsing; the column styles still apply
+        table.add_row(*map(Text, row))
 
     console.print(table)
 
@@ -238,6 +293,7 @@ def list_scenarios(library, generated):
 @click.argument("scenario_file", required=False)
 @click.option(
     "--all",
+    "validate_all",
     is_flag=True,
     help="Validate all scenario files in the scenarios folder",
 )
@@ -251,13 +307,15 @@ def list_scenarios(library, generated):
     is_flag=True,
     help="Only validate generated scenarios (excludes library)",
 )
-def validate(scenario_file, all, library_only, generated_only):
+def validate(scenario_file, validate_all, library_only, generated_only):
     """Validate scenario file(s) against the template schema.
 
     If no scenario_file is provided and --all is not specified,
     validates all scenarios by default.
     """
 
+    from cli.scenario_manager import ScenarioManager
+
     if library_only and generated_only:
         console.print(
             "❌ [red]Cannot specify both --library-only and --generated-only[/red]"
@@ -292,28 +350,48 @@ def validate(scenario_file, all, library_only, generated_only):
         invalid_scenarios = 0
         validation_results = []
 
-        for scenario_info in scenarios:
-            scenario_path = scenario_info["file_path"]
-            scenario_name = scenario_info["metadata"].get(
-                "name", Path(scenario_path).stem
-            )
+        # Validate concurrently; results come back in listing order
+        results = manager.validate_scenarios([s["file_path"] for s in scenarios])
 
-            try:
-                is_valid, errors = manager.validate_scenario(scenario_path)
+        # Render the per-file lines into one buffer and write it in one go
+        with console.capture() as capture:
+            for scenario_info, (result, exc) in zip(scenarios, results):
+                scenario_path = scenario_info["file_path"]
+                scenario_name = scenario_info["metadata"].get(
+                    "name", Path(scenario_path).stem
+                )
 
-                if is_valid:
-                    valid_scenarios += 1
-                    validation_results.append(
-                        {
-                            "file": scenario_path,
-                            "name": scenario_name,
-                            "valid": True,
-                            "errors": [],
-                        }
-                    )
-                    console.print(
-                        f"✅ [green]{scenario_name}[/green] ({Path(scenario_path).name})"
-                    )
+                if exc is None:
+                    is_valid, errors = result
+
+                    if is_valid:
+                        valid_scenarios += 1
+                        validation_results.append(
+                            {
+                                "file": scenario_path,
+                                "name": scenario_name,
+                                "valid": True,
+                                "errors": [],
+                            }
+                        )
+                        console.print(
+                            f"✅ [green]{scenario_name}[/green] ({Path(scenario_path).name})"
+                        )
+                    else:
+                        invalid_scenarios += 1
+                        validation_results.append(
+                            {
+                                "file": scenario_path,
+                                "name": scenario_name,
+                                "valid": False,
+                                "errors": errors,
+                            }
+                        )
+                        console.print(
+                            f"❌ [red]{scenario_name}[/red] ({Path(scenario_path).name})"
+                        )
+                        for error in errors:
+                            console.print(f"   • {error}")
                 else:
                     invalid_scenarios += 1
                     validation_results.append(
@@ -321,28 +399,15 @@ def validate(scenario_file, all, library_only, generated_only):
                             "file": scenario_path,
                             "name": scenario_name,
                             "valid": False,
-                            "errors": errors,
+                            "errors": [f"Exception during validation: {exc}"],
                         }
                     )
                     console.print(
-                        f"❌ [red]{scenario_name}[/red] ({Path(scenario_path).name})"
+                        f"❌ [red]{scenario_name}[/red] ({Path(scenario_path).name}) - Error: {exc}"
                     )
-                    for error in errors:
-                        console.print(f"   • {error}")
-
-            except Exception as e:
-                invalid_scenarios += 1
-                validation_results.append(
-                    {
-                        "file": scenario_path,
-                        "name": scenario_name,
-                        "valid": False,
-                        "errors": [f"Exception during validation: {e}"],
-                    }
-                )
-                console.print(
-                    f"❌ [red]{scenario_name}[/red] ({Path(scenario_path).name}) - Error: {e}"
-                )
+
+        console.file.write(capture.get())
+        console.file.flush()
 
         # Print summary
         console.print(f"\n📊 [bold blue]Validation Summary[/bold blue]")
@@ -360,7 +425,7 @@ def validate(scenario_file, all, library_only, generated_only):
 
     else:
         # Validate single scenario file
-        if not Path(scenario_file).exists():
+        if not os.path.exists(scenario_file):
             console.print(f"❌ [red]Scenario file not found: {scenario_file}[/red]")
             sys.exit(1)
 
@@ -391,37 +456,71 @@ def validate(scenario_file, all, library_only, generated_only):
     is_flag=True,
     help="Include generated scenarios in statistics",
 )
-def stats(include_generated):
+@click.option(
+    "--plain", is_flag=True, help="Print tab-separated counts without formatting"
+)
+def stats(include_generated, plain):
     """Show statistics about available scenarios."""
 
-    console.print("\n📊 [bold blue]Scenario Statistics[/bold blue]\n")
+    from cli.scenario_manager import ScenarioManager
 
     manager = ScenarioManager()
     stats_data = manager.get_statistics(include_generated=include_generated)
 
-    # Total scenarios
-    console.print(f"[bold]Total Scenarios:[/bold] {stats_data['total']}")
-    console.print(f"[bold]Library Scenarios:[/bold] {stats_data['library_count']}")
+    if plain:
+        # One "<group>\t[<key>\t]<count>" line per figure, bypassing Rich
+        lines = [
+            f"total\t{stats_data['total']}",
+            f"library\t{stats_data['library_count']}",
+        ]
+        if include_generated:
+            lines.append(f"generated\t{stats_data['generated_count']}")
+        for group, key in (
+            ("sector", "by_sector"),
+            ("difficulty", "by_difficulty"),
+            ("inspiration", "by_inspiration"),
+        ):
+            lines.extend(
+                f"{group}\t{name}\t{count}" for name, count in stats_data[key].items()
+            )
+        sys.stdout.write("\n".join(lines) + "\n")
+        return
+
+    console.print("\n📊 [bold blue]Scenario Statistics[/bold blue]\n")
+
+    # Build the report up front and render it with a single print
+    lines = [
+        f"[bold]Total Scenarios:[/bold] {stats_data['total']}",
+        f"[bold]Library Scenarios:[/bold] {stats_data['library_count']}",
+    ]
     if include_generated:
-        console.print(
+        lines.append(
             f"[bold]Generated Scenarios:[/bold] {stats_data['generated_count']}"
         )
 
     # By sector
-    console.print("\n[bold]By Sector:[/bold]")
-    for sector, count in stats_data["by_sector"].items():
-        console.print(f"  • {sector.title()}: {count}")
+    lines.append("\n[bold]By Sector:[/bold]")
+    lines.extend(
+        f"  • {sector.title()}: {count}"
+        for sector, count in stats_data["by_sector"].items()
+    )
 
     # By difficulty
-    console.print("\n[bold]By Difficulty:[/bold]")
-    for difficulty, count in stats_data["by_difficulty"].items():
-        console.print(f"  • {difficulty.title()}: {count}")
+    lines.append("\n[bold]By Difficulty:[/bold]")
+    lines.extend(
+        f"  • {difficulty.title()}: {count}"
+        for difficulty, count in stats_data["by_difficulty"].items()
+    )
 
     # By inspiration
     if stats_data["by_inspiration"]:
-        console.print("\n[bold]By Historical Attack:[/bold]")
-        for attack, count in stats_data["by_inspiration"].items():
-            console.print(f"  • {attack}: {count}")
+        lines.append("\n[bold]By Historical Attack:[/bold]")
+        lines.extend(
+            f"  • {attack}: {count}"
+            for attack, count in stats_data["by_inspiration"].items()
+        )
+
+    console.print("\n".join(lines))
 
 
 @cli.command()
@@ -434,7 +533,13 @@ def setup():
     dirs_to_create = ["scenarios/library", "scenarios/generated", "logs", "exports"]
 
     for dir_path in dirs_to_create:
-        Path(dir_path).mkdir(parents=True, exist_ok=True)
+        path = Path(dir_path)
+        try:
+            path.mkdir(parents=True)
+        except FileExistsError:
+            if not path.is_dir():
+                raise
+            continue
         console.print(f"✅ Created directory: {dir_path}")
 
     # Check Google Cloud authentication
@@ -545,6 +650,44 @@ def setup():
         )
 
 
+# Set by Cloud Run, Cloud Functions, App Engine and metadata server overrides
+_GOOGLE_RUNTIME_ENV = (
+    "K_SERVICE",
+    "CLOUD_RUN_JOB",
+    "FUNCTION_TARGET",
+    "GAE_APPLICATION",
+    "GCE_METADATA_HOST",
+    "GCE_METADATA_IP",
+)
+
+
+def _on_google_cloud() -> bool:
+    """Whether ADC may be served by a Google Cloud metadata server"""
+    if any(os.getenv(name) for name in _GOOGLE_RUNTIME_ENV):
+        return True
+
+    # Compute Engine and GKE nodes identify themselves in the DMI product name
+    try:
+        with open("/sys/class/dmi/id/product_name") as f:
+            return f.read().startswith("Google")
+    except OSError:
+        return False
+
+
+def _gcloud_adc_path() -> str:
+    """Path of gcloud's ADC file, located the same way google.auth does"""
+    config_dir = os.getenv("CLOUDSDK_CONFIG")
+    if not config_dir:
+        if os.name != "nt":
+            config_dir = os.path.join(os.path.expanduser("~"), ".config", "gcloud")
+        elif os.getenv("APPDATA"):
+            config_dir = os.path.join(os.environ["APPDATA"], "gcloud")
+        else:
+            drive = os.getenv("SystemDrive", "C:")
+            config_dir = os.path.join(drive, "\\", "gcloud")
+    return os.path.join(config_dir, "application_default_credentials.json")
+
+
 def _check_gcp_authentication():
     """
     Check for available Google Cloud authentication methods.
@@ -552,6 +695,14 @@ def _check_gcp_authentication():
     Returns:
         dict: Authentication status with method, project, and availability
     """
+    return copy.deepcopy(_detect_gcp_authentication())
+
+
+# Detection runs once per process; callers get copies through
+# _check_gcp_authentication so the cached result cannot be changed
+@lru_cache(maxsize=1)
+def _detect_gcp_authentication():
+    """Detect available Google Cloud authentication methods"""
     auth_info = {
         "has_credentials": False,
         "method": None,
@@ -571,19 +722,29 @@ def _check_gcp_authentication():
     service_account_path = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
     if service_account_path and os.path.isfile(service_account_path):
         try:
-            import json
-
-            with open(service_account_path, "r") as f:
-                sa_data = json.load(f)
-                if "project_id" in sa_data:
-                    auth_info["has_credentials"] = True
-                    auth_info["method"] = "service_account"
-                    auth_info["project"] = sa_data["project_id"]
-                    return auth_info
+            with open(service_account_path, "rb") as f:
+                raw = f.read()
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError
+            sa_data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            if "project_id" in sa_data:
+                auth_info["has_credentials"] = True
+                auth_info["method"] = "service_account"
+                auth_info["project"] = sa_data["project_id"]
+                return auth_info
         except (json.JSONDecodeError, IOError):
             pass
 
-    # Method 3: Check for Application Default Credentials (ADC)
+    # Method 3: Check for Application Default Credentials (ADC). Importing
+    # google.auth is slow, so skip it when nothing points at a credentials
+    # file, a gcloud ADC file or a metadata server.
+    if not (
+        service_account_path
+        or os.getenv("GOOGLE_CLOUD_PROJECT")
+        or os.path.isfile(_gcloud_adc_path())
+        or _on_google_cloud()
+    ):
+        return auth_info
+
     try:
         from google.auth import default as google_default_credentials
         from google.auth.exceptions import DefaultCredentialsError
@@ -608,32 +769,6 @@ def _check_gcp_authentication():
     return auth_info
 
 
-def clean_scenario_for_yaml(scenario):
-    """Clean scenario data to ensure proper YAML serialization without Python objects"""
-    import copy
-    from datetime import datetime
-
-    # Deep copy to avoid modifying original
-    clean_scenario = copy.deepcopy(scenario)
-
-    # Function to recursively clean any remaining objects
-    def clean_value(value):
-        if isinstance(value, dict):
-            return {k: clean_value(v) for k, v in value.items()}
-        elif isinstance(value, list):
-            return [clean_value(item) for item in value]
-        elif isinstance(value, datetime):
-            return value.isoformat()
-        elif hasattr(value, "to_dict"):  # Handle any remaining dataclass objects
-            return clean_value(value.to_dict())
-        elif hasattr(value, "__dict__"):  # Handle any other objects
-            return clean_value(value.__dict__)
-        else:
-            return value
-
-    return clean_value(clean_scenario)
-
-
 @cli.command()
 @click.argument("scenario_file")
 @click.option(
@@ -644,7 +779,7 @@ def clean_scenario_for_yaml(scenario):
 def clean(scenario_file, output):
     """Clean a scenario file for YAML serialization."""
 
-    if not Path(scenario_file).exists():
+    if not os.path.exists(scenario_file):
         console.print(f"❌ [red]Scenario file not found: {scenario_file}[/red]")
         sys.exit(1)
 
@@ -654,8 +789,7 @@ def clean(scenario_file, output):
 
     try:
         # Load scenario
-        with open(scenario_file, "r") as f:
-            scenario = yaml.safe_load(f)
+        scenario = _yaml.load_path(scenario_file)
 
         # Clean scenario data
         cleaned_scenario = clean_scenario_for_yaml(scenario)
@@ -667,8 +801,8 @@ def clean(scenario_file, output):
             output_path = Path(f"{scenario_file}.clean.yaml")
 
         # Save cleaned scenario
-        with open(output_path, "w") as f:
-            yaml.dump(cleaned_scenario, f, default_flow_style=False, indent=2)
+        with open(output_path, "wb") as f:
+            _yaml.dump(cleaned_scenario, f)
 
         console.print("\n✅ [green]Scenario cleaned and saved successfully![/green]")
         console.print(f"📁 Saved to: {output_path}")
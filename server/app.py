@@ -34,7 +34,7 @@ try:
     print(f"✅ AI Facilitator initialized: {type(facilitator).__name__}")
 except Exception as e:
     print(f"Warning: AI Facilitator initialization failed: {e}")
-    from facilitator.ai_facilitator import MockFacilitator
+    from facilitator.mock_facilitator import MockFacilitator
 
     facilitator = MockFacilitator()
     print("🔄 Using MockFacilitator as fallback")
@@ -372,8 +372,10 @@ def investigate():
                 }
             )
 
-        # Load scenario data for facilitator
+        # Load scenario data and the evidence found so far for facilitator
         facilitator.load_scenario(scenario)
+        for evidence in game_session.evidence_discovered:
+            facilitator.add_evidence(evidence)
 
         # Get facilitator response
         facilitator_response = facilitator.facilitate_action(action, details)
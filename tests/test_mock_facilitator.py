@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests for the mock facilitator's canned investigation responses
+"""
+
+import os
+import sys
+
+# Add the parent directory to the path so we can import from facilitator
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from facilitator.mock_facilitator import _INVESTIGATION_RESPONSES, MockFacilitator
+
+
+def test_multi_keyword_action_uses_category_priority():
+    """The category listed first wins, whatever the word order in the action"""
+    facilitator = MockFacilitator()
+
+    for action, category in (
+        ("Review network log entries", "log"),
+        ("Check the log of network connections", "log"),
+        ("Look for ransomware file artifacts", "file"),
+        ("Trace the process that sent the email", "email"),
+    ):
+        response = facilitator.facilitate_action(action)
+        assert response.content in _INVESTIGATION_RESPONSES[category], action
+
+
+def test_action_without_keyword_defaults_to_log():
+    """Actions naming no category get a log finding"""
+    response = MockFacilitator().facilitate_action("Interview the help desk")
+
+    assert response.content in _INVESTIGATION_RESPONSES["log"]
+
+
+def main():
+    """Run the tests"""
+    tests = [
+        test_multi_keyword_action_uses_category_priority,
+        test_action_without_keyword_defaults_to_log,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e!r}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-scenario facilitator response cache
+"""
+
+import os
+import sys
+import tempfile
+from importlib.util import find_spec
+
+# Add the parent directory to the path so we can import from utils
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from facilitator.ai_facilitator import FacilitatorResponse
+from utils.response_cache import FacilitatorCache
+
+FIREWALL_RESPONSE = FacilitatorResponse(
+    content="Outbound connections to 203.0.113.7 on port 443",
+    confidence=0.9,
+    suggestions=["Check proxy logs"],
+)
+
+
+def test_exact_hit_after_normalization():
+    """A repeated request is served regardless of case and punctuation"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = FacilitatorCache("TEST-001", cache_dir=temp_dir)
+        cache.set("Check firewall logs", FIREWALL_RESPONSE, {"clue_1"})
+
+        response = cache.get("  check FIREWALL logs! ", {"clue_1"})
+
+        assert response == FIREWALL_RESPONSE
+
+
+def test_hit_survives_reload():
+    """Responses are persisted and visible to a new cache instance"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        FacilitatorCache("TEST-001", cache_dir=temp_dir).set(
+            "Check firewall logs", FIREWALL_RESPONSE
+        )
+
+        reloaded = FacilitatorCache("TEST-001", cache_dir=temp_dir)
+
+        assert reloaded.get("Check firewall logs") == FIREWALL_RESPONSE
+
+
+def test_miss_for_other_request_or_scenario():
+    """Unknown requests and other scenarios miss"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = FacilitatorCache("TEST-001", cache_dir=temp_dir)
+        cache.set("Check firewall logs", FIREWALL_RESPONSE)
+
+        assert cache.get("Examine running processes") is None
+        other = FacilitatorCache("TEST-002", cache_dir=temp_dir)
+        assert other.get("Check firewall logs") is None
+
+
+def test_miss_when_clue_state_differs():
+    """A response generated under other revealed clues is not replayed"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = FacilitatorCache("TEST-001", cache_dir=temp_dir)
+        cache.set("Check firewall logs", FIREWALL_RESPONSE, {"clue_1"})
+
+        assert cache.get("Check firewall logs") is None
+        assert cache.get("Check firewall logs", {"clue_1", "clue_2"}) is None
+        assert cache.get("Check firewall logs", ["clue_1"]) == FIREWALL_RESPONSE
+
+
+def test_near_miss_without_semantic_matching():
+    """Similar wording about different evidence misses by default"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = FacilitatorCache("TEST-001", cache_dir=temp_dir)
+        cache.set("Check firewall logs", FIREWALL_RESPONSE)
+
+        assert cache.semantic is False
+        assert cache.get("Check proxy logs") is None
+
+
+def test_semantic_threshold():
+    """With semantic matching on, only requests above the threshold match"""
+    if find_spec("numpy") is None:
+        print("⏭️  numpy not installed, skipping semantic threshold test")
+        return
+
+    import numpy as np
+
+    vectors = {
+        "check firewall logs": [1.0, 0.0],
+        "look at the firewall logs": [0.96, 0.28],
+        "check proxy logs": [0.8, 0.6],
+    }
+
+    def fake_embed(texts):
+        return np.array(
+            [vectors[" ".join(t.lower().split())] for t in texts], dtype=np.float32
+        )
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = FacilitatorCache("TEST-001", cache_dir=temp_dir)
+        cache.semantic = True
+        cache._embed = fake_embed
+        cache.set("Check firewall logs", FIREWALL_RESPONSE, {"clue_1"})
+
+        assert cache.get("Look at the firewall logs", {"clue_1"}) == (
+            FIREWALL_RESPONSE
+        )
+        assert cache.get("Check proxy logs", {"clue_1"}) is None
+        assert cache.get("Look at the firewall logs", {"clue_2"}) is None
+
+
+def main():
+    """Run the tests"""
+    tests = [
+        test_exact_hit_after_normalization,
+        test_hit_survives_reload,
+        test_miss_for_other_request_or_scenario,
+        test_miss_when_clue_state_differs,
+        test_near_miss_without_semantic_matching,
+        test_semantic_threshold,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e!r}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
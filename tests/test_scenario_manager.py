@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Tests for ScenarioManager parse caching and metadata listing
+"""
+
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from importlib.util import find_spec
+from pathlib import Path
+
+# Add the parent directory to the path so we can import from cli
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cli.scenario_manager as scenario_manager_module
+from cli.scenario_manager import ScenarioManager
+
+SCENARIO_TEMPLATE = """scenario_metadata:
+  name: {name}
+  id: {scenario_id}
+  version: "1.0"
+  difficulty: beginner
+  environment:
+    sector: healthcare
+    organization:
+      name: Test Clinic
+attack_overview:
+  kill_chain:
+  - phase: initial_access
+    description: Phishing email
+initial_alert:
+  alert_type: EDR
+  timestamp: "2024-01-01T00:00:00Z"
+  description: Suspicious process
+"""
+
+
+@contextmanager
+def scenario_workspace():
+    """Run inside a temporary project directory with its own cache dir"""
+    original_cwd = os.getcwd()
+    original_cache_dir = scenario_manager_module._CACHE_DIR
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.chdir(temp_dir)
+        scenario_manager_module._CACHE_DIR = Path(temp_dir) / "cache"
+        try:
+            yield Path(temp_dir)
+        finally:
+            scenario_manager_module._CACHE_DIR = original_cache_dir
+            os.chdir(original_cwd)
+
+
+def write_scenario(path: Path, name: str, scenario_id: str, mtime: float):
+    """Write a minimal scenario file with a fixed modification time"""
+    path.write_text(SCENARIO_TEMPLATE.format(name=name, scenario_id=scenario_id))
+    os.utime(path, (mtime, mtime))
+
+
+def test_parse_cache_invalidated_on_change():
+    """An edited file is parsed again instead of served from the cache"""
+    with scenario_workspace():
+        manager = ScenarioManager()
+        path = manager.library_dir / "test.yaml"
+        write_scenario(path, "Original", "TEST-001", 1_000_000)
+
+        assert manager.get_scenario("TEST-001")["scenario_metadata"]["name"] == (
+            "Original"
+        )
+
+        write_scenario(path, "Edited", "TEST-001", 2_000_000)
+        scenario = manager._load_yaml_cached(path)
+        assert scenario["scenario_metadata"]["name"] == "Edited"
+
+
+def test_get_scenario_returns_copy():
+    """Mutating a returned scenario does not change the cached parse"""
+    with scenario_workspace():
+        manager = ScenarioManager()
+        write_scenario(manager.library_dir / "test.yaml", "Clinic", "TEST-001", 1e6)
+
+        scenario = manager.get_scenario("TEST-001")
+        scenario["scenario_metadata"]["name"] = "Mutated"
+
+        assert manager.get_scenario("TEST-001")["scenario_metadata"]["name"] == (
+            "Clinic"
+        )
+
+
+def test_parse_cache_persisted_outside_scenarios():
+    """The parse cache is written to the cache dir and reused by new managers"""
+    with scenario_workspace() as workspace:
+        manager = ScenarioManager()
+        path = manager.library_dir / "test.yaml"
+        write_scenario(path, "Clinic", "TEST-001", 1e6)
+        manager._load_yaml_cached(path)
+        manager._save_parse_cache()
+
+        assert manager.parse_cache_file.parent == workspace / "cache"
+        assert manager.parse_cache_file.exists()
+        assert not list((workspace / "scenarios").glob("*.pkl"))
+
+        reloaded = ScenarioManager()
+        assert path in reloaded._parse_cache
+
+
+def test_parse_cache_drops_deleted_files():
+    """Entries for files removed behind the manager's back are not persisted"""
+    with scenario_workspace():
+        manager = ScenarioManager()
+        kept = manager.library_dir / "a.yaml"
+        removed = manager.library_dir / "b.yaml"
+        write_scenario(kept, "Alpha", "TEST-001", 1e6)
+        write_scenario(removed, "Beta", "TEST-002", 1e6)
+        manager._load_yaml_cached(kept)
+        manager._load_yaml_cached(removed)
+
+        removed.unlink()
+        manager._save_parse_cache()
+
+        assert list(ScenarioManager()._parse_cache) == [kept]
+
+
+def test_listing_reads_metadata_only():
+    """Listing parses just the metadata block, not the whole scenario"""
+    with scenario_workspace():
+        manager = ScenarioManager()
+        write_scenario(manager.library_dir / "b.yaml", "Beta", "TEST-002", 1e6)
+        write_scenario(manager.library_dir / "a.yaml", "Alpha", "TEST-001", 1e6)
+
+        scenarios = manager.list_scenarios()
+
+        assert [s["metadata"]["name"] for s in scenarios] == ["Alpha", "Beta"]
+        assert scenarios[0]["metadata"]["environment"]["sector"] == "healthcare"
+        assert scenarios[0]["is_library"] is True
+        assert not manager._parse_cache
+
+
+def test_listing_caches_metadata_until_file_changes():
+    """Metadata blocks are parsed once per file version and kept across runs"""
+    with scenario_workspace():
+        manager = ScenarioManager()
+        path = manager.library_dir / "a.yaml"
+        write_scenario(path, "Alpha", "TEST-001", 1_000_000)
+
+        reads = []
+        original_read_metadata = scenario_manager_module._read_metadata
+
+        def counting_read_metadata(path, size):
+            reads.append(path)
+            return original_read_metadata(path, size)
+
+        scenario_manager_module._read_metadata = counting_read_metadata
+        try:
+            manager.list_scenarios()
+            manager.list_scenarios()
+            assert len(reads) == 1
+
+            manager._save_parse_cache()
+            ScenarioManager().list_scenarios()
+            assert len(reads) == 1
+
+            write_scenario(path, "Edited", "TEST-001", 2_000_000)
+            assert manager.list_scenarios()[0]["metadata"]["name"] == "Edited"
+            assert len(reads) == 2
+        finally:
+            scenario_manager_module._read_metadata = original_read_metadata
+
+
+def test_listing_skips_file_broken_after_metadata():
+    """A file whose YAML breaks past the metadata block is not listed"""
+    with scenario_workspace():
+        manager = ScenarioManager()
+        write_scenario(manager.library_dir / "a.yaml", "Alpha", "TEST-001", 1e6)
+        broken = manager.library_dir / "b.yaml"
+        broken.write_text(
+            SCENARIO_TEMPLATE.format(name="Beta", scenario_id="TEST-002")
+            + "evidence: [unclosed\n"
+        )
+
+        scenarios = manager.list_scenarios()
+
+        assert [s["metadata"]["name"] for s in scenarios] == ["Alpha"]
+
+
+def test_import_and_delete_keep_id_map_without_rebuilding_index():
+    """Imports and deletes update single entries instead of rewriting the index"""
+    with scenario_workspace() as workspace:
+        manager = ScenarioManager()
+        write_scenario(manager.library_dir / "a.yaml", "Alpha", "TEST-001", 1e6)
+        assert manager.get_scenario("TEST-001") is not None
+
+        source = workspace / "incoming.yaml"
+        write_scenario(source, "Beta", "TEST-002", 1e6)
+        manager.import_scenario(str(source))
+
+        dest_path = manager.generated_dir / "test-002.yaml"
+        assert manager._id_to_path["TEST-002"] == dest_path
+        assert manager.get_scenario("TEST-002")["scenario_metadata"]["name"] == "Beta"
+
+        assert manager.delete_scenario("TEST-002")
+        assert "TEST-002" not in manager._id_to_path
+        assert manager.get_scenario("TEST-002") is None
+
+        assert not manager.index_file.exists()
+        assert not manager.binary_index_file.exists()
+
+
+def test_index_round_trip():
+    """The saved index is reused for listings and its JSON export stays readable"""
+    with scenario_workspace():
+        manager = ScenarioManager()
+        write_scenario(manager.library_dir / "a.yaml", "Alpha", "TEST-001", 1e6)
+        manager.create_scenario_index(export_json=True)
+
+        assert manager.index_file.read_text().startswith("{\n  ")
+
+        reloaded = ScenarioManager()
+        entry = reloaded._load_index()[str(manager.library_dir / "a.yaml")]
+        assert entry["size"] > 0
+        assert entry["is_library"] is True
+        assert entry["metadata"]["name"] == "Alpha"
+
+
+def test_binary_index_is_typed():
+    """A msgpack index that does not match the schema is not used"""
+    if find_spec("msgspec") is None:
+        print("⏭️  msgspec not installed, skipping typed index test")
+        return
+
+    import msgspec
+
+    with scenario_workspace():
+        manager = ScenarioManager()
+        write_scenario(manager.library_dir / "a.yaml", "Alpha", "TEST-001", 1e6)
+        manager.create_scenario_index()
+
+        index = msgspec.msgpack.decode(manager.binary_index_file.read_bytes())
+        assert index["scenarios"][0]["sector"] == "healthcare"
+
+        index["files"][str(manager.library_dir / "a.yaml")]["size"] = "large"
+        manager.binary_index_file.write_bytes(msgspec.msgpack.encode(index))
+        assert ScenarioManager()._load_index() == {}
+
+
+def main():
+    """Run the tests"""
+    tests = [
+        test_parse_cache_invalidated_on_change,
+        test_get_scenario_returns_copy,
+        test_parse_cache_persisted_outside_scenarios,
+        test_parse_cache_drops_deleted_files,
+        test_listing_reads_metadata_only,
+        test_listing_caches_metadata_until_file_changes,
+        test_listing_skips_file_broken_after_metadata,
+        test_import_and_delete_keep_id_map_without_rebuilding_index,
+        test_index_round_trip,
+        test_binary_index_is_typed,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e!r}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -89,7 +89,7 @@ class MitreAttackHandler:
             )
 
         except Exception as e:
-            self.logger.error(f"Error loading MITRE data: {e}")
+            self.logger.error("Error loading MITRE data: %s", e)
             self._load_minimal_dataset()
 
     def _load_minimal_dataset(self):
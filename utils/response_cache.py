@@ -0,0 +1,301 @@
+"""
+Response Cache for Incidenter
+Persists facilitator responses per scenario so repeated investigation
+requests can be answered without another model round trip
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+from dataclasses import asdict
+from functools import lru_cache
+from importlib.util import find_spec
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from facilitator.ai_facilitator import FacilitatorResponse
+
+# Near-duplicate matching needs sentence-transformers (and numpy, which it
+# depends on); without them only exact matches are served
+SEMANTIC_AVAILABLE = (
+    find_spec("sentence_transformers") is not None and find_spec("numpy") is not None
+)
+
+_DEFAULT_CACHE_DIR = Path("~/.cache/incidenter").expanduser()
+_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+_SIMILARITY_THRESHOLD = 0.85
+# Unit-norm embeddings are stored as int8, each component scaled by this
+_QUANT_SCALE = 127
+_NON_WORD = re.compile(r"[^\w\s]+")
+_UNSAFE_FILENAME = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+@lru_cache(maxsize=1)
+def _embedder():
+    """Load the sentence embedding model once per process"""
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(_EMBEDDING_MODEL)
+
+
+def _quantize(vectors):
+    """Quantize unit-norm float rows to int8"""
+    import numpy as np
+
+    return np.round(vectors * _QUANT_SCALE).astype(np.int8)
+
+
+def normalize_request(request: str) -> str:
+    """Lowercase a request and collapse punctuation and whitespace"""
+    return " ".join(_NON_WORD.sub(" ", request.lower()).split())
+
+
+def _clue_state(revealed_clues: Iterable[str]) -> str:
+    """Canonical form of the revealed clues a response was generated under"""
+    return ",".join(sorted(revealed_clues))
+
+
+class FacilitatorCache:
+    """
+    Stores facilitator responses for one scenario, keyed by request and by
+    the clues revealed when the response was generated
+    """
+
+    def __init__(
+        self,
+        scenario_id: str,
+        cache_dir: Optional[Path] = None,
+        semantic: bool = False,
+    ):
+        """
+        Initialize the cache for a scenario
+
+        Args:
+            scenario_id: ID of the scenario the responses belong to
+            cache_dir: Directory for cache files (default: ~/.cache/incidenter)
+            semantic: Also match similar requests by embedding similarity
+                when sentence-transformers is installed. Similar wording can
+                still ask about different evidence, so this is opt-in.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.scenario_id = scenario_id
+        self.cache_dir = Path(cache_dir) if cache_dir else _DEFAULT_CACHE_DIR
+        safe_id = _UNSAFE_FILENAME.sub("_", scenario_id)
+        self.cache_file = self.cache_dir / f"{safe_id}.json"
+        self.embeddings_file = self.cache_dir / f"{safe_id}.npy"
+        self.index_file = self.cache_dir / f"{safe_id}.index.json"
+        self.semantic = semantic and SEMANTIC_AVAILABLE
+
+        self._entries: Dict[str, Dict[str, Any]] = self._load()
+
+        # Quantized unit-norm request embeddings, row i belonging to
+        # _index_keys[i]. Loaded (memory-mapped) or built on the first
+        # semantic lookup.
+        self._index_keys: List[str] = []
+        self._embeddings = None
+
+    def _key(self, request: str, clues: str) -> str:
+        """Exact-match key for a request and clue state within this scenario"""
+        text = f"{self.scenario_id}|{normalize_request(request)}|{clues}"
+        return hashlib.sha256(text.encode()).hexdigest()[:16]
+
+    def get(
+        self, request: str, revealed_clues: Iterable[str] = ()
+    ) -> Optional[FacilitatorResponse]:
+        """
+        Look up a cached response for a request
+
+        Args:
+            request: The player's investigation request
+            revealed_clues: IDs of the clues revealed so far
+
+        Returns:
+            The cached FacilitatorResponse, or None on a miss
+        """
+        clues = _clue_state(revealed_clues)
+        entry = self._entries.get(self._key(request, clues))
+        if entry is None and self.semantic and self._entries:
+            entry = self._nearest(request, clues)
+
+        if entry is None:
+            return None
+
+        return FacilitatorResponse(
+            content=entry["content"],
+            confidence=entry["confidence"],
+            suggestions=list(entry["suggestions"]),
+            additional_context=entry.get("additional_context"),
+            requires_followup=entry.get("requires_followup", False),
+        )
+
+    def set(
+        self,
+        request: str,
+        response: FacilitatorResponse,
+        revealed_clues: Iterable[str] = (),
+    ):
+        """
+        Store a response and persist the cache
+
+        Args:
+            request: The player's investigation request
+            response: The facilitator's response to it
+            revealed_clues: IDs of the clues revealed when it was generated
+        """
+        clues = _clue_state(revealed_clues)
+        key = self._key(request, clues)
+        is_new = key not in self._entries
+        self._entries[key] = {"request": request, "clues": clues, **asdict(response)}
+
+        if is_new and self._embeddings is not None:
+            self._add_to_index(key, request)
+
+        self._save()
+
+    def _nearest(self, request: str, clues: str) -> Optional[Dict[str, Any]]:
+        """Find the most similar request cached under the same clue state"""
+        import numpy as np
+
+        try:
+            if self._embeddings is None:
+                self._build_index()
+
+            rows = [
+                i
+                for i, key in enumerate(self._index_keys)
+                if self._entries[key].get("clues") == clues
+            ]
+            if not rows:
+                return None
+
+            # Accumulate in int32: sums of 384 int8 products overflow int16
+            query = _quantize(self._embed([request])[0]).astype(np.int32)
+            scores = self._embeddings[rows].astype(np.int32) @ query
+            best = int(scores.argmax())
+            if scores[best] < _SIMILARITY_THRESHOLD * _QUANT_SCALE**2:
+                return None
+        except Exception as e:
+            self.logger.warning("Semantic cache lookup failed: %s", e)
+            self.semantic = False
+            return None
+
+        return self._entries[self._index_keys[rows[best]]]
+
+    def _build_index(self):
+        """Load the persisted index and embed any requests it is missing"""
+        import numpy as np
+
+        self._index_keys, self._embeddings = self._load_index()
+
+        indexed = set(self._index_keys)
+        missing = [k for k in self._entries if k not in indexed]
+        if not missing:
+            return
+
+        vectors = _quantize(
+            self._embed([self._entries[k]["request"] for k in missing])
+        )
+        if self._index_keys:
+            self._embeddings = np.concatenate([self._embeddings, vectors])
+        else:
+            self._embeddings = vectors
+        self._index_keys.extend(missing)
+        self._save_index()
+
+    def _load_index(self):
+        """Load persisted embeddings, memory-mapped, with their keys"""
+        import numpy as np
+
+        empty = ([], np.zeros((0, 0), dtype=np.int8))
+        try:
+            with open(self.index_file, "r") as f:
+                index = json.load(f)
+            embeddings = np.load(self.embeddings_file, mmap_mode="r")
+        except FileNotFoundError:
+            return empty
+        except Exception as e:
+            self.logger.warning("Ignoring unreadable embedding index: %s", e)
+            return empty
+
+        if not isinstance(index, dict):
+            return empty
+
+        keys = index.get("keys", [])
+        if (
+            index.get("model") != _EMBEDDING_MODEL
+            or embeddings.dtype != np.int8
+            or len(keys) != len(embeddings)
+            or not all(k in self._entries for k in keys)
+        ):
+            return empty
+
+        return keys, embeddings
+
+    def _add_to_index(self, key: str, request: str):
+        """Append one request's embedding to the index"""
+        import numpy as np
+
+        try:
+            vector = _quantize(self._embed([request]))
+        except Exception as e:
+            self.logger.warning("Could not embed cached request: %s", e)
+            return
+
+        if self._index_keys:
+            self._embeddings = np.concatenate([self._embeddings, vector])
+        else:
+            self._embeddings = vector
+        self._index_keys.append(key)
+        self._save_index()
+
+    def _embed(self, texts: List[str]):
+        """Embed texts as unit-norm float32 rows"""
+        return _embedder().encode(
+            texts, convert_to_numpy=True, normalize_embeddings=True
+        ).astype("float32")
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Load cached responses from disk"""
+        try:
+            with open(self.cache_file, "r") as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            self.logger.warning("Ignoring unreadable response cache: %s", e)
+            return {}
+
+        return entries if isinstance(entries, dict) else {}
+
+    def _save(self):
+        """Write the cache atomically"""
+        tmp_file = self.cache_file.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(tmp_file, "w") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_file, self.cache_file)
+        except OSError as e:
+            self.logger.warning("Could not save response cache: %s", e)
+
+    def _save_index(self):
+        """Write the embeddings and their keys atomically"""
+        import numpy as np
+
+        suffix = f".{os.getpid()}.tmp"
+        tmp_embeddings = self.embeddings_file.with_name(
+            self.embeddings_file.name + suffix
+        )
+        tmp_index = self.index_file.with_name(self.index_file.name + suffix)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(tmp_embeddings, "wb") as f:
+                np.save(f, np.ascontiguousarray(self._embeddings))
+            with open(tmp_index, "w") as f:
+                json.dump({"model": _EMBEDDING_MODEL, "keys": self._index_keys}, f)
+            os.replace(tmp_embeddings, self.embeddings_file)
+            os.replace(tmp_index, self.index_file)
+        except OSError as e:
+            self.logger.warning("Could not save embedding index: %s", e)
@@ -5,12 +5,26 @@ Handles game session state, persistence, and management
 
 import json
 import logging
+import time
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
 from pathlib import Path
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, is_dataclass
 import uuid
 
+# Journals without a session file are swept once idle this long, in seconds;
+# a session still in progress keeps appending and is left alone
+_ORPHAN_JOURNAL_AGE = 24 * 60 * 60
+
+
+def _journal_default(value: Any) -> Any:
+    """JSON fallback for journal records holding dataclasses or datetimes"""
+    if is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
 
 @dataclass
 class SessionState:
@@ -143,7 +157,12 @@ class SessionManager:
             with open(session_file, "w") as f:
                 json.dump(session_dict, f, indent=2, default=str)
 
-            self.logger.debug(f"Saved session {session.session_id}")
+            # A snapshot holding its full lists has folded the journal in;
+            # keeping it would replay the same records again on load
+            if not session.metadata.get("journaled_fields"):
+                session_file.with_suffix(".jsonl").unlink(missing_ok=True)
+
+            self.logger.debug("Saved session %s", session.session_id)
 
             # Clean up old sessions after saving
             self._cleanup_old_sessions(self.max_sessions)
@@ -151,9 +170,78 @@ class SessionManager:
             return True
 
         except Exception as e:
-            self.logger.error(f"Error saving session {session.session_id}: {e}")
+            self.logger.error("Error saving session %s: %s", session.session_id, e)
+            return False
+
+    def append_event(self, session_id: str, field: str, record: Dict[str, Any]) -> bool:
+        """
+        Append one record to a session's journal
+
+        Journaled records live in <session_id>.jsonl next to the session file
+        and are merged into the named list field when the session is loaded,
+        so callers can persist each event as it happens and save only a small
+        snapshot (with metadata["journaled_fields"] naming the field) later.
+
+        Args:
+            session_id: ID of the session the record belongs to
+            field: SessionState list field the record belongs in
+            record: JSON-serializable record (dataclasses and datetimes are
+                converted)
+
+        Returns:
+            True if appended successfully
+        """
+        try:
+            line = json.dumps(
+                {"field": field, "record": record}, default=_journal_default
+            )
+            with open(self.sessions_dir / f"{session_id}.jsonl", "a") as f:
+                f.write(line + "\n")
+            return True
+
+        except Exception as e:
+            self.logger.error("Error journaling session %s: %s", session_id, e)
+            return False
+
+    def discard_journal(self, session_id: str) -> bool:
+        """
+        Delete a session's journal, e.g. when the player chooses not to save
+
+        Args:
+            session_id: ID of the session whose journal to delete
+
+        Returns:
+            True if the journal is gone
+        """
+        try:
+            (self.sessions_dir / f"{session_id}.jsonl").unlink(missing_ok=True)
+            return True
+
+        except Exception as e:
+            self.logger.error("Error discarding journal %s: %s", session_id, e)
             return False
 
+    def _replay_journal(self, session_id: str, session_dict: Dict[str, Any]) -> None:
+        """Merge journaled records into the fields the snapshot left to the journal"""
+        metadata = session_dict.get("metadata") or {}
+        journaled = set(metadata.get("journaled_fields", ()))
+        journal_file = self.sessions_dir / f"{session_id}.jsonl"
+        if not journaled or not journal_file.exists():
+            return
+
+        with open(journal_file, "r") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line from an interrupted write
+                    self.logger.warning("Skipping bad journal line in %s", session_id)
+                    continue
+                if event.get("field") in journaled:
+                    session_dict.setdefault(event["field"], []).append(event["record"])
+
     def load_session(self, session_id: str) -> Optional[SessionState]:
         """
         Load session from disk
@@ -172,12 +260,17 @@ class SessionManager:
             session_file = self.sessions_dir / f"{session_id}.json"
 
             if not session_file.exists():
-                self.logger.warning(f"Session file not found: {session_id}")
+                self.logger.warning("Session file not found: %s", session_id)
                 return None
 
             with open(session_file, "r") as f:
                 session_dict = json.load(f)
 
+            # Fill in fields persisted record by record; the loaded lists are
+            # then complete, so a later save writes them out in full
+            self._replay_journal(session_id, session_dict)
+            (session_dict.get("metadata") or {}).pop("journaled_fields", None)
+
             # Convert datetime strings back to datetime objects
             session_dict["start_time"] = datetime.fromisoformat(
                 session_dict["start_time"]
@@ -194,11 +287,11 @@ class SessionManager:
             session = SessionState(**session_dict)
             self._session_cache[session_id] = session
 
-            self.logger.debug(f"Loaded session {session_id}")
+            self.logger.debug("Loaded session %s", session_id)
             return session
 
         except Exception as e:
-            self.logger.error(f"Error loading session {session_id}: {e}")
+            self.logger.error("Error loading session %s: %s", session_id, e)
             return None
 
     def list_sessions(self, include_completed: bool = True) -> List[Dict[str, Any]]:
@@ -227,6 +320,9 @@ class SessionManager:
                     ):
                         continue
 
+                    # CLI snapshots leave actions and theories to the journal
+                    self._replay_journal(session_id, session_data)
+
                     sessions.append(
                         {
                             "session_id": session_id,
@@ -274,6 +370,7 @@ class SessionManager:
 
             if session_file.exists():
                 session_file.unlink()
+                session_file.with_suffix(".jsonl").unlink(missing_ok=True)
 
                 # Remove from cache
                 if session_id in self._session_cache:
@@ -631,8 +728,9 @@ class SessionManager:
                         if session_id in self._session_cache:
                             del self._session_cache[session_id]
 
-                        # Delete the file
+                        # Delete the file and its journal
                         session_file.unlink()
+                        session_file.with_suffix(".jsonl").unlink(missing_ok=True)
 
                         self.logger.info(f"Cleaned up old session: {session_id}")
 
@@ -645,9 +743,25 @@ class SessionManager:
                     f"Cleaned up {len(files_to_delete)} old sessions, keeping {max_sessions} most recent"
                 )
 
+            self._cleanup_orphan_journals()
+
         except Exception as e:
             self.logger.error(f"Error during session cleanup: {e}")
 
+    def _cleanup_orphan_journals(self) -> None:
+        """Delete idle journals whose session was never saved"""
+        cutoff = time.time() - _ORPHAN_JOURNAL_AGE
+        for journal_file in self.sessions_dir.glob("*.jsonl"):
+            try:
+                if (
+                    not journal_file.with_suffix(".json").exists()
+                    and journal_file.stat().st_mtime < cutoff
+                ):
+                    journal_file.unlink()
+                    self.logger.info("Cleaned up orphan journal: %s", journal_file.stem)
+            except OSError as e:
+                self.logger.warning("Could not clean up %s: %s", journal_file, e)
+
     def cleanup_sessions(self, max_sessions: int = None) -> int:
         """
         Manually trigger cleanup of old sessions